@@ -0,0 +1,1107 @@
+"""
+Benchmark suite for the Ramayana scraper.
+
+This module serves a synthetic valmikiramayan.net-style site from a local HTTP
+server and runs the real crawl path of scrapper.py against it, so throughput
+can be measured without touching the live site.
+
+The mock site mirrors the layout the scraper is built for:
+- An index page linking to the contents page of every kanda
+- Contents pages with a table of sarga links
+- Sarga pages that are framesets of a shared navigation frame, a Sanskrit
+  frame with p.SanSloka verses and an English frame
+- robots.txt, ETag revalidation, and configurable latency and error rate
+
+Each configuration (workers, backend, parse workers, parser, output format) is
+crawled in a fresh process, which reports pages/sec, chapters/sec, p50/p99
+chapter latency, CPU time and peak RSS.
+
+Microbenchmarks (--micro) time single functions of the scraper in this
+process, against the implementation they replaced, on text of the mock site.
+
+Usage:
+    python benchmark.py [options]
+    python benchmark.py --serve [--port PORT]
+    python benchmark.py --micro devanagari,fix_encoding [--sargas N] [--verses N]
+
+Example:
+    python benchmark.py --sargas 50 --workers 1,4,16 --backends requests,aiohttp
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import scrapper
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; CPU and RSS are not reported
+    resource = None
+
+
+# Constants
+KANDAS = ["baala", "ayodhya", "aranya", "kishkindha", "sundara", "yuddha"]
+DEFAULT_KANDAS = 2
+DEFAULT_SARGAS = 20
+DEFAULT_VERSES = 30
+DEFAULT_LATENCY_MS = 20.0
+DEFAULT_SEED = 0
+# Seconds a single crawl may take before its configuration is reported as failed
+DEFAULT_TIMEOUT = 600.0
+# Seconds between checks whether a crawl process is still alive
+POLL_SECONDS = 1.0
+# Microbenchmarks report the best of MICRO_REPEAT batches of calls
+MICRO_REPEAT = 5
+# Syllables the synthetic shlokas are built from
+SYLLABLES = "रा म सी ता ल क्ष्म णः भ र तः धर् मः व नं".split()
+
+
+class MockSite:
+    """
+    Deterministic synthetic site in the layout of valmikiramayan.net.
+
+    Pages are generated on demand from the request path; the same seed always
+    yields the same site.
+
+    Attributes:
+        kandas (List[str]): Names of the kandas on the site.
+        sargas (int): Number of sargas per kanda.
+        verses (int): Number of verses per sarga.
+    """
+
+    def __init__(
+        self,
+        kandas: int = DEFAULT_KANDAS,
+        sargas: int = DEFAULT_SARGAS,
+        verses: int = DEFAULT_VERSES,
+        seed: int = DEFAULT_SEED,
+    ):
+        """
+        Initialize the site.
+
+        Args:
+            kandas (int, optional): Number of kandas, at most len(KANDAS).
+                Defaults to DEFAULT_KANDAS.
+            sargas (int, optional): Sargas per kanda. Defaults to DEFAULT_SARGAS.
+            verses (int, optional): Verses per sarga. Defaults to DEFAULT_VERSES.
+            seed (int, optional): Seed of the generated text. Defaults to DEFAULT_SEED.
+        """
+        self.kandas = KANDAS[: max(1, min(kandas, len(KANDAS)))]
+        self.sargas = sargas
+        self.verses = verses
+        self.seed = seed
+
+    @property
+    def chapters(self) -> int:
+        """Total number of sarga pages on the site."""
+        return len(self.kandas) * self.sargas
+
+    def _shloka(self, kanda_number: int, sarga: int, verse: int) -> str:
+        """Generate the text of one verse."""
+        rng = random.Random(f"{self.seed}-{kanda_number}-{sarga}-{verse}")
+        lines = [
+            " ".join(
+                "".join(rng.choices(SYLLABLES, k=rng.randint(2, 5))) for _ in range(4)
+            )
+            for _ in range(2)
+        ]
+        return f"{lines[0]} |<br>{lines[1]} || {kanda_number}-{sarga}-{verse}"
+
+    def index(self) -> str:
+        """Index page linking to the contents page of every kanda."""
+        links = "".join(
+            f'<li><a href="utf8/{kanda}/{kanda}_contents.htm">{kanda.title()}</a></li>'
+            for kanda in self.kandas
+        )
+        return (
+            "<html><head><title>Ramayana</title></head>"
+            f"<body><ul>{links}</ul></body></html>"
+        )
+
+    def contents(self, kanda: str) -> str:
+        """Contents page of a kanda."""
+        rows = "".join(
+            f'<tr><td><a href="sarga{n}/{kanda}_{n}_frame.htm">{n}. Sarga {n}</a></td>'
+            f'<td><a href="sarga{n}/{kanda}_{n}_frame.htm">Sarga {n}</a></td></tr>'
+            for n in range(1, self.sargas + 1)
+        )
+        return (
+            "<html><head><title>Contents</title></head>"
+            f"<body><table>{rows}</table></body></html>"
+        )
+
+    def frameset(self, kanda: str, sarga: int) -> str:
+        """Frameset page of a sarga."""
+        return (
+            f"<html><head><title>Sarga {sarga}</title></head>"
+            '<frameset cols="20%,80%"><frame src="../../nav.htm">'
+            f'<frame src="{kanda}_{sarga}_sans.htm">'
+            f'<frame src="{kanda}_{sarga}_eng.htm">'
+            "</frameset></html>"
+        )
+
+    def sanskrit(self, kanda: str, sarga: int) -> str:
+        """Sanskrit frame of a sarga, alternating verses and translations."""
+        kanda_number = self.kandas.index(kanda) + 1
+        body = "".join(
+            f'<p class="SanSloka">{self._shloka(kanda_number, sarga, verse)}</p>'
+            f'<p class="tat">Translation of verse {verse}</p>'
+            for verse in range(1, self.verses + 1)
+        )
+        return (
+            f'<html><head><meta charset="utf-8"><title>{kanda} {sarga}</title>'
+            f"</head><body>{body}</body></html>"
+        )
+
+    def english(self, kanda: str, sarga: int) -> str:
+        """English frame of a sarga."""
+        body = "".join(
+            f"<p>Commentary on verse {verse} of sarga {sarga}.</p>"
+            for verse in range(1, self.verses + 1)
+        )
+        return f"<html><body>{body}</body></html>"
+
+    def page(self, path: str) -> Optional[Tuple[str, str]]:
+        """
+        Render the page at a path.
+
+        Args:
+            path (str): Request path without query string.
+
+        Returns:
+            Optional[Tuple[str, str]]: Content type and body, or None if there
+                is no page at the path.
+        """
+        if path in ("/", "/index.htm"):
+            return "text/html", self.index()
+        if path == "/robots.txt":
+            return "text/plain", "User-agent: *\nDisallow: /private/\n"
+        if path == "/utf8/nav.htm":
+            return "text/html", "<html><body><a href='/'>Home</a></body></html>"
+
+        parts = path.strip("/").split("/")
+        if len(parts) < 3 or parts[0] != "utf8" or parts[1] not in self.kandas:
+            return None
+        kanda = parts[1]
+        if len(parts) == 3 and parts[2] == f"{kanda}_contents.htm":
+            return "text/html", self.contents(kanda)
+        if len(parts) != 4 or not parts[2].startswith("sarga"):
+            return None
+
+        try:
+            sarga = int(parts[2][len("sarga") :])
+        except ValueError:
+            return None
+        if not 1 <= sarga <= self.sargas:
+            return None
+        renderers = {
+            f"{kanda}_{sarga}_frame.htm": self.frameset,
+            f"{kanda}_{sarga}_sans.htm": self.sanskrit,
+            f"{kanda}_{sarga}_eng.htm": self.english,
+        }
+        renderer = renderers.get(parts[3])
+        if renderer is None:
+            return None
+        return "text/html", renderer(kanda, sarga)
+
+
+class MockServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server for a MockSite with injected latency and errors.
+
+    Attributes:
+        site (MockSite): Site being served.
+        latency (float): Base delay of every response in seconds.
+        jitter (float): Maximum random delay added to the base latency in seconds.
+        error_rate (float): Probability of answering a page request with 503.
+        requests_served (int): Number of requests answered so far.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        site: MockSite,
+        port: int = 0,
+        latency: float = DEFAULT_LATENCY_MS / 1000,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+    ):
+        """
+        Bind the server to localhost.
+
+        Args:
+            site (MockSite): Site to serve.
+            port (int, optional): Port to listen on, 0 for a free port. Defaults to 0.
+            latency (float, optional): Base response delay in seconds.
+                Defaults to DEFAULT_LATENCY_MS / 1000.
+            jitter (float, optional): Maximum extra random delay in seconds.
+                Defaults to 0.0.
+            error_rate (float, optional): Probability of a 503 response.
+                Defaults to 0.0.
+        """
+        super().__init__(("127.0.0.1", port), MockRequestHandler)
+        self.site = site
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(site.seed)
+
+    @property
+    def base_url(self) -> str:
+        """URL of the index page."""
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def next_response_plan(self) -> Tuple[float, bool]:
+        """
+        Draw the delay of the next response and whether it fails.
+
+        Returns:
+            Tuple[float, bool]: Delay in seconds, and True if the response
+                should be a 503 error.
+        """
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            return delay, self._random.random() < self.error_rate
+
+    def start(self) -> threading.Thread:
+        """
+        Serve requests on a daemon thread.
+
+        Returns:
+            threading.Thread: The serving thread.
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Request handler answering GET requests from the server's MockSite."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY the body
+    # can wait for a delayed ACK, which would dominate the measured latency
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        """Serve a page, honoring If-None-Match, after the injected delay."""
+        delay, fail = self.server.next_response_plan()
+        time.sleep(delay)
+
+        path = self.path.split("?", 1)[0]
+        page = self.server.site.page(path)
+        if fail and path != "/robots.txt":
+            self._send(503, b"Service Unavailable", "text/plain")
+            return
+        if page is None:
+            self._send(404, b"Not Found", "text/plain")
+            return
+
+        content_type, text = page
+        body = text.encode("utf-8")
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", content_type, etag)
+        else:
+            self._send(200, body, content_type, etag)
+
+    def _send(
+        self, status: int, body: bytes, content_type: str, etag: Optional[str] = None
+    ) -> None:
+        """Write a complete response."""
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """Log requests at debug level instead of writing them to stderr."""
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """
+    Get a percentile of a list of values with the nearest-rank method.
+
+    Args:
+        values (List[float]): Values, in any order.
+        fraction (float): Percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        Optional[float]: The percentile, or None if there are no values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(fraction * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def _peak_rss_mb(who: int) -> Optional[float]:
+    """Get the peak resident set size of the process or its children in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _cpu_seconds() -> Optional[float]:
+    """Get the CPU time used by the process and its reaped children."""
+    if resource is None:
+        return None
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def _run_configuration(
+    config: Dict[str, Any], base_url: str, output_dir: str, results, start_method: str
+) -> None:
+    """
+    Crawl the mock site with one configuration and report the measurements.
+
+    Runs in a freshly spawned process, so CPU time and peak RSS only cover
+    this crawl.
+
+    Args:
+        config (Dict[str, Any]): Configuration with 'workers', 'backend',
+            'parse_workers', 'parser', 'format', 'rate' and 'http_cache' keys.
+        base_url (str): URL of the mock site's index page.
+        output_dir (str): Directory the crawl writes to.
+        results: multiprocessing queue receiving the measurement dictionary,
+            or a dictionary with an 'error' key if the crawl failed.
+        start_method (str): Default multiprocessing start method of the
+            benchmark process. Spawned processes default to "spawn", so it is
+            restored for the parse workers to start the way they do when the
+            scraper is run directly.
+    """
+    multiprocessing.set_start_method(start_method, force=True)
+    try:
+        results.put(_measure_configuration(config, base_url, output_dir))
+    except Exception as e:
+        results.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def _measure_configuration(
+    config: Dict[str, Any], base_url: str, output_dir: str
+) -> Dict[str, Any]:
+    """Crawl the mock site with one configuration and measure the crawl."""
+    logging.basicConfig(level=logging.WARNING)
+    scrapper.set_html_parser(config["parser"])
+
+    # Time every chapter page from the first request to its last parsed frame
+    latencies: List[float] = []
+    scrape_webpage_async = scrapper.scrape_webpage_async
+
+    async def timed_scrape_webpage_async(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await scrape_webpage_async(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    scrapper.scrape_webpage_async = timed_scrape_webpage_async
+
+    http_cache = None
+    if config["http_cache"]:
+        http_cache = scrapper.HTTPCache(os.path.join(output_dir, ".http_cache"))
+    session = scrapper.create_session(
+        pool_maxsize=scrapper.connection_pool_size(config["workers"]),
+        rate_limiter=scrapper.RateLimiter(config["rate"], scrapper.DEFAULT_BURST),
+        http_cache=http_cache,
+    )
+    session.headers.update({"User-Agent": scrapper.USER_AGENTS[0]})
+    args = argparse.Namespace(
+        url=base_url,
+        format=config["format"],
+        fix_encoding=False,
+        directory=output_dir,
+        workers=config["workers"],
+        backend=config["backend"],
+        resume=False,
+        parse_workers=config["parse_workers"],
+        max_depth=None,
+        bloom_filter=0,
+    )
+
+    cpu_start = _cpu_seconds()
+    start = time.perf_counter()
+    scrapper.process_all_kandas(args, session)
+    seconds = time.perf_counter() - start
+    cpu_end = _cpu_seconds()
+
+    with open(
+        os.path.join(output_dir, scrapper.SUMMARY_FILENAME), encoding="utf-8"
+    ) as f:
+        summary = json.load(f)
+
+    # Parse workers are separate processes; report the largest process
+    peak_rss = None
+    if resource is not None:
+        peak_rss = max(
+            _peak_rss_mb(resource.RUSAGE_SELF), _peak_rss_mb(resource.RUSAGE_CHILDREN)
+        )
+    return {
+        "seconds": seconds,
+        "chapters": summary["successful"],
+        "failed": summary["failed"],
+        "p50_ms": _ms(percentile(latencies, 0.5)),
+        "p99_ms": _ms(percentile(latencies, 0.99)),
+        "cpu_s": None if cpu_start is None else cpu_end - cpu_start,
+        "peak_rss_mb": peak_rss,
+        "stage_seconds": {
+            stage: timing["total_seconds"]
+            for stage, timing in summary.get("stage_timings", {}).items()
+        },
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    """Convert seconds to milliseconds, keeping None."""
+    return None if seconds is None else seconds * 1000
+
+
+def _wait_for_measurement(process, results, timeout: float) -> Dict[str, Any]:
+    """
+    Wait for the measurement of a crawl process.
+
+    Args:
+        process (multiprocessing.Process): Process running _run_configuration().
+        results: multiprocessing queue the process reports to.
+        timeout (float): Seconds to wait before the process is terminated.
+
+    Returns:
+        Dict[str, Any]: The measurement, or a dictionary with an 'error' key if
+            the process exited without reporting or timed out.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return results.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            pass
+        if process.exitcode is not None:
+            # The process may have reported just before exiting
+            try:
+                return results.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                return {"error": f"crawl process exited with code {process.exitcode}"}
+        if time.monotonic() > deadline:
+            process.terminate()
+            return {"error": f"crawl timed out after {timeout:g}s"}
+
+
+def run_benchmark(
+    server: MockServer,
+    configs: List[Dict[str, Any]],
+    passes: int = 1,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> List[Dict[str, Any]]:
+    """
+    Crawl the mock site once per configuration and pass, printing a table row
+    per crawl.
+
+    Args:
+        server (MockServer): Running mock server.
+        configs (List[Dict[str, Any]]): Configurations, see _run_configuration().
+        passes (int, optional): Number of crawls per configuration. Passes of
+            a configuration share the output directory and HTTP cache, so
+            later passes measure warm-cache crawls. Defaults to 1.
+        timeout (float, optional): Seconds a crawl may take before it is
+            terminated. Defaults to DEFAULT_TIMEOUT.
+
+    Returns:
+        List[Dict[str, Any]]: One result per configuration and pass, with the
+            configuration, 'pass', 'requests', 'pages_per_sec' and
+            'chapters_per_sec' added to the measurements. Crawls that failed,
+            crashed or timed out only have the configuration, 'pass',
+            'requests' and an 'error' message. 'stage_seconds'
+            holds the total time of each crawl stage, see
+            scrapper.StageMetrics.
+    """
+    widths = column_widths(REPORT_COLUMNS, configs)
+    print(format_header(widths=widths), flush=True)
+    start_method = multiprocessing.get_start_method()
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for config in configs:
+        with tempfile.TemporaryDirectory(prefix="scraper-bench-") as output_dir:
+            for run in range(1, passes + 1):
+                results_queue = context.Queue()
+                requests_before = server.requests_served
+                process = context.Process(
+                    target=_run_configuration,
+                    args=(
+                        config,
+                        server.base_url,
+                        output_dir,
+                        results_queue,
+                        start_method,
+                    ),
+                )
+                process.start()
+                measurement = _wait_for_measurement(process, results_queue, timeout)
+                process.join()
+
+                requests_served = server.requests_served - requests_before
+                if "error" in measurement:
+                    logging.error(
+                        f"Configuration {config} failed: {measurement['error']}"
+                    )
+                    result = {
+                        **config,
+                        "pass": run,
+                        "requests": requests_served,
+                        "error": measurement["error"],
+                    }
+                    results.append(result)
+                    print(format_result(result, widths=widths), flush=True)
+                    continue
+
+                seconds = measurement["seconds"]
+                result = {
+                    **config,
+                    "pass": run,
+                    **measurement,
+                    "requests": requests_served,
+                    "pages_per_sec": requests_served / seconds if seconds else None,
+                    "chapters_per_sec": (
+                        measurement["chapters"] / seconds if seconds else None
+                    ),
+                }
+                results.append(result)
+                print(format_result(result, widths=widths), flush=True)
+    return results
+
+
+def _best_seconds(func: Callable[[], Any], number: int) -> float:
+    """Best time of one call in seconds, over MICRO_REPEAT batches of calls."""
+    return min(timeit.repeat(func, number=number, repeat=MICRO_REPEAT)) / number
+
+
+def _time_cases(
+    benchmark: str, cases: Dict[str, Callable[[], Any]], items: int, number: int
+) -> List[Dict[str, Any]]:
+    """
+    Time the cases of a microbenchmark.
+
+    Args:
+        benchmark (str): Name of the microbenchmark.
+        cases (Dict[str, Callable[[], Any]]): Functions to time by case name.
+            The first case is the baseline the speedups are relative to.
+        items (int): Number of items each call processes.
+        number (int): Calls per batch.
+
+    Returns:
+        List[Dict[str, Any]]: One result per case with 'benchmark', 'case',
+            'items', 'us_per_call' and 'speedup'.
+    """
+    results = []
+    for case, func in cases.items():
+        seconds = _best_seconds(func, number)
+        baseline = results[0]["us_per_call"] if results else seconds * 1e6
+        results.append(
+            {
+                "benchmark": benchmark,
+                "case": case,
+                "items": items,
+                "us_per_call": seconds * 1e6,
+                "speedup": baseline / (seconds * 1e6),
+            }
+        )
+    return results
+
+
+def _any_devanagari_loop(text: str) -> bool:
+    """Devanagari check replaced by is_devanagari_text(): a loop over every character."""
+    return any(0x0900 <= ord(c) <= 0x097F for c in text)
+
+
+def micro_devanagari(site: MockSite) -> List[Dict[str, Any]]:
+    """
+    Time Devanagari detection on the paragraphs of a sarga.
+
+    The paragraphs are the verses, translations and commentary of the first
+    sarga, plus five English paragraphs containing a single Devanagari word.
+
+    Args:
+        site (MockSite): Site the text is taken from.
+
+    Returns:
+        List[Dict[str, Any]]: Results of the per-character loop, of
+            is_devanagari_text() and of is_devanagari_text() with a minimum
+            ratio, see _time_cases().
+    """
+    paragraphs = []
+    for verse in range(1, site.verses + 1):
+        paragraphs.append(site._shloka(1, 1, verse).replace("<br>", "\n"))
+        paragraphs.append(f"Translation of verse {verse}")
+        paragraphs.append(f"Commentary on verse {verse} of sarga 1.")
+    paragraphs.extend(f"Rama is called राम in verse {verse}." for verse in range(5))
+
+    cases = {
+        "per-character loop": lambda: [_any_devanagari_loop(p) for p in paragraphs],
+        "regex": lambda: [scrapper.is_devanagari_text(p) for p in paragraphs],
+        "regex, ratio 0.5": lambda: [
+            scrapper.is_devanagari_text(p, 0.5) for p in paragraphs
+        ],
+    }
+    return _time_cases("devanagari", cases, len(paragraphs), number=200)
+
+
+def _fix_verses_loop(verses: List[str]) -> List[str]:
+    """Encoding repair replaced by fix_verses(): one encode/decode per verse."""
+    fixed = []
+    for verse in verses:
+        try:
+            fixed.append(verse.encode("latin1").decode("utf-8"))
+        except Exception as e:
+            logging.debug(f"Error fixing verse encoding: {e}")
+            fixed.append(verse)
+    return fixed
+
+
+def micro_fix_encoding(site: MockSite) -> List[Dict[str, Any]]:
+    """
+    Time encoding repair of the verses of every sarga of the first kanda.
+
+    Each sarga is one document, as in fix_encoding(). The verses are all
+    mojibake (UTF-8 decoded as Latin-1), all decoded correctly, or mixed,
+    alternating between the two.
+
+    Args:
+        site (MockSite): Site the text is taken from.
+
+    Returns:
+        List[Dict[str, Any]]: Results of the per-verse loop and of
+            fix_verses() for each kind of input, see _time_cases().
+    """
+    documents = [
+        [
+            site._shloka(1, sarga, verse).replace("<br>", "\n")
+            for verse in range(1, site.verses + 1)
+        ]
+        for sarga in range(1, site.sargas + 1)
+    ]
+    garbled = [
+        [verse.encode("utf-8").decode("latin-1") for verse in verses]
+        for verses in documents
+    ]
+    inputs = {
+        "mojibake": garbled,
+        "correct": documents,
+        "mixed": [
+            [bad if i % 2 else good for i, (good, bad) in enumerate(zip(*pair))]
+            for pair in zip(documents, garbled)
+        ],
+    }
+
+    results = []
+    for kind, docs in inputs.items():
+        cases = {
+            f"{kind}: loop": lambda docs=docs: [_fix_verses_loop(d) for d in docs],
+            f"{kind}: fix_verses": lambda docs=docs: [
+                scrapper.fix_verses(d) for d in docs
+            ],
+        }
+        results.extend(
+            _time_cases("fix_encoding", cases, site.sargas * site.verses, number=20)
+        )
+    return results
+
+
+MICROBENCHMARKS: Dict[str, Callable[[MockSite], List[Dict[str, Any]]]] = {
+    "devanagari": micro_devanagari,
+    "fix_encoding": micro_fix_encoding,
+}
+
+
+REPORT_COLUMNS = [
+    ("backend", "backend", "{}"),
+    ("workers", "workers", "{}"),
+    ("parse", "parse_workers", "{}"),
+    ("parser", "parser", "{}"),
+    ("format", "format", "{}"),
+    ("pass", "pass", "{}"),
+    ("chapters", "chapters", "{}"),
+    ("requests", "requests", "{}"),
+    ("seconds", "seconds", "{:.2f}"),
+    ("pages/s", "pages_per_sec", "{:.1f}"),
+    ("p50 ms", "p50_ms", "{:.1f}"),
+    ("p99 ms", "p99_ms", "{:.1f}"),
+    ("cpu s", "cpu_s", "{:.2f}"),
+    ("rss MiB", "peak_rss_mb", "{:.1f}"),
+]
+MICRO_COLUMNS = [
+    ("benchmark", "benchmark", "{}"),
+    ("case", "case", "{}"),
+    ("items", "items", "{}"),
+    ("us/call", "us_per_call", "{:.1f}"),
+    ("speedup", "speedup", "{:.2f}x"),
+]
+COLUMN_WIDTH = 10
+MICRO_COLUMN_WIDTH = 22
+
+
+def column_widths(
+    columns: List[Tuple[str, str, str]] = REPORT_COLUMNS,
+    rows: Optional[List[Dict[str, Any]]] = None,
+    width: int = COLUMN_WIDTH,
+) -> List[int]:
+    """
+    Compute the width of each column of a report table.
+
+    Args:
+        columns (List[Tuple[str, str, str]], optional): Title, result key and
+            format of each column. Defaults to REPORT_COLUMNS.
+        rows (List[Dict[str, Any]], optional): Values known before the table is
+            printed, such as the benchmark configurations. Defaults to None.
+        width (int, optional): Minimum width of a column. Defaults to COLUMN_WIDTH.
+
+    Returns:
+        List[int]: Width of each column, leaving at least two spaces before
+            the title and the longest known value.
+    """
+    widths = []
+    for title, key, template in columns:
+        cells = [title]
+        cells.extend(
+            template.format(row[key]) for row in rows or [] if row.get(key) is not None
+        )
+        widths.append(max(width, max(len(cell) for cell in cells) + 2))
+    return widths
+
+
+def format_header(
+    columns: List[Tuple[str, str, str]] = REPORT_COLUMNS,
+    widths: Optional[List[int]] = None,
+) -> str:
+    """Format the header line of the report table, see format_result()."""
+    widths = widths or column_widths(columns)
+    return "".join(title.rjust(w) for (title, _, _), w in zip(columns, widths))
+
+
+def format_result(
+    result: Dict[str, Any],
+    columns: List[Tuple[str, str, str]] = REPORT_COLUMNS,
+    widths: Optional[List[int]] = None,
+) -> str:
+    """
+    Format one result as a line of the report table.
+
+    Args:
+        result (Dict[str, Any]): Result from run_benchmark().
+        columns (List[Tuple[str, str, str]], optional): Title, result key and
+            format of each column. Defaults to REPORT_COLUMNS.
+        widths (Optional[List[int]], optional): Width of each column. Defaults
+            to the widths of the column titles, see column_widths().
+
+    Returns:
+        str: Fixed-width table row.
+    """
+    widths = widths or column_widths(columns)
+    cells = []
+    for (_, key, template), w in zip(columns, widths):
+        value = result.get(key)
+        cells.append(("-" if value is None else template.format(value)).rjust(w))
+    return "".join(cells)
+
+
+def run_microbenchmarks(site: MockSite, names: List[str]) -> List[Dict[str, Any]]:
+    """
+    Run microbenchmarks in this process and print their results.
+
+    Args:
+        site (MockSite): Site the benchmarked text is taken from.
+        names (List[str]): Names of the microbenchmarks, see MICROBENCHMARKS.
+
+    Returns:
+        List[Dict[str, Any]]: Results of all microbenchmarks, see _time_cases().
+    """
+    widths = column_widths(MICRO_COLUMNS, width=MICRO_COLUMN_WIDTH)
+    print(format_header(MICRO_COLUMNS, widths), flush=True)
+    results = []
+    for name in names:
+        for result in MICROBENCHMARKS[name](site):
+            results.append(result)
+            print(format_result(result, MICRO_COLUMNS, widths), flush=True)
+    return results
+
+
+def _int_list(value: str) -> List[int]:
+    """Parse a comma-separated list of integers."""
+    return [int(item) for item in value.split(",") if item]
+
+
+def _str_list(value: str) -> List[str]:
+    """Parse a comma-separated list of strings."""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _write_results(
+    path: str, args: argparse.Namespace, site: MockSite, results: List[Dict[str, Any]]
+) -> None:
+    """Write the site parameters and the results to a JSON file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "site": {
+                    "kandas": len(site.kandas),
+                    "sargas": site.sargas,
+                    "verses": site.verses,
+                    "latency_ms": args.latency,
+                    "jitter_ms": args.jitter,
+                    "error_rate": args.error_rate,
+                    "seed": args.seed,
+                },
+                "results": results,
+            },
+            f,
+            indent=4,
+        )
+    logging.info(f"Results written to {path}")
+
+
+def main() -> None:
+    """
+    Main entry point for the benchmark.
+
+    Command line arguments:
+        --kandas: Number of kandas on the mock site
+        --sargas: Number of sargas per kanda
+        --verses: Number of verses per sarga
+        --latency: Base response latency in milliseconds
+        --jitter: Maximum extra random latency in milliseconds
+        --error-rate: Probability of a 503 response
+        --seed: Seed of the generated site, latencies and errors
+        --workers: Comma-separated worker counts to benchmark
+        --backends: Comma-separated fetch backends to benchmark
+        --parse-workers: Comma-separated parse worker counts to benchmark
+        --parsers: Comma-separated HTML parsers to benchmark
+        --formats: Comma-separated output formats to benchmark
+        --rate: Requests per second per host, 0 to disable rate limiting
+        --http-cache: Crawl with an HTTP cache
+        --passes: Number of crawls per configuration
+        --timeout: Seconds a crawl may take before it is reported as failed
+        --json: Write the results to a JSON file
+        --serve: Only serve the mock site until interrupted
+        --port: Port of the mock server
+        --micro: Comma-separated microbenchmarks to run instead of crawling
+        --debug: Enable debug logging
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Sanskrit text scraper against a local mock site"
+    )
+    parser.add_argument(
+        "--kandas",
+        type=int,
+        default=DEFAULT_KANDAS,
+        help=f"Number of kandas (default: {DEFAULT_KANDAS})",
+    )
+    parser.add_argument(
+        "--sargas",
+        type=int,
+        default=DEFAULT_SARGAS,
+        help=f"Sargas per kanda (default: {DEFAULT_SARGAS})",
+    )
+    parser.add_argument(
+        "--verses",
+        type=int,
+        default=DEFAULT_VERSES,
+        help=f"Verses per sarga (default: {DEFAULT_VERSES})",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=DEFAULT_LATENCY_MS,
+        help=f"Base response latency in ms (default: {DEFAULT_LATENCY_MS})",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        help="Maximum extra random latency in ms (default: 0)",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Probability of a 503 response (default: 0)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"Random seed (default: {DEFAULT_SEED})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_int_list,
+        default=[1, 4],
+        help="Comma-separated worker counts (default: 1,4)",
+    )
+    parser.add_argument(
+        "--backends",
+        type=_str_list,
+        default=["requests"],
+        help="Comma-separated fetch backends (default: requests)",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=_int_list,
+        default=[0, 2],
+        help="Comma-separated parse worker counts (default: 0,2)",
+    )
+    parser.add_argument(
+        "--parsers",
+        type=_str_list,
+        default=[scrapper.DEFAULT_PARSER],
+        help=f"Comma-separated HTML parsers (default: {scrapper.DEFAULT_PARSER})",
+    )
+    parser.add_argument(
+        "--formats",
+        type=_str_list,
+        default=["json"],
+        help="Comma-separated output formats (default: json)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Requests per second per host, 0 to disable (default: 0)",
+    )
+    parser.add_argument(
+        "--http-cache",
+        action="store_true",
+        help="Crawl with an HTTP cache; use --passes 2 to measure warm crawls",
+    )
+    parser.add_argument(
+        "--passes", type=int, default=1, help="Crawls per configuration (default: 1)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="Seconds a crawl may take before its configuration is reported as "
+        f"failed (default: {DEFAULT_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--json", metavar="FILE", help="Write the results to a JSON file"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Only serve the mock site until interrupted",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=0,
+        help="Port of the mock server (default: any free port)",
+    )
+    parser.add_argument(
+        "--micro",
+        type=_str_list,
+        help="Comma-separated microbenchmarks to run instead of crawling "
+        f"({', '.join(MICROBENCHMARKS)})",
+    )
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    args = parser.parse_args()
+    if args.micro:
+        unknown = set(args.micro) - set(MICROBENCHMARKS)
+        if unknown:
+            parser.error(f"unknown microbenchmarks: {', '.join(sorted(unknown))}")
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    site = MockSite(args.kandas, args.sargas, args.verses, args.seed)
+    if args.micro:
+        results = run_microbenchmarks(site, args.micro)
+        if args.json:
+            _write_results(args.json, args, site, results)
+        return
+
+    server = MockServer(
+        site, args.port, args.latency / 1000, args.jitter / 1000, args.error_rate
+    )
+    server.start()
+    logging.info(
+        f"Serving {site.chapters} sargas in {len(site.kandas)} kandas "
+        f"at {server.base_url}"
+    )
+
+    if args.serve:
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+        return
+
+    backends = [b for b in args.backends if b in scrapper.FETCH_BACKENDS]
+    for backend in set(args.backends) - set(backends):
+        logging.warning(f"Skipping unknown fetch backend: {backend}")
+    if "aiohttp" in backends and scrapper.aiohttp is None:
+        logging.warning("Skipping the aiohttp backend: aiohttp is not installed")
+        backends.remove("aiohttp")
+
+    matrix = itertools.product(
+        backends, args.workers, args.parse_workers, args.parsers, args.formats
+    )
+    configs = [
+        {
+            "backend": backend,
+            "workers": workers,
+            "parse_workers": parse_workers,
+            "parser": parser_name,
+            "format": output_format,
+            "rate": args.rate,
+            "http_cache": args.http_cache,
+        }
+        for backend, workers, parse_workers, parser_name, output_format in matrix
+    ]
+
+    try:
+        results = run_benchmark(server, configs, max(1, args.passes), args.timeout)
+    finally:
+        server.shutdown()
+
+    if args.json:
+        _write_results(args.json, args, site, results)
+
+
+if __name__ == "__main__":
+    main()
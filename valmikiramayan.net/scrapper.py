@@ -6,12 +6,21 @@ specifically targeting Ramayana texts. It can extract Sanskrit text from modern
 websites as well as older sites using framesets.
 
 Features:
-- Scrape single pages or entire chapter collections
+- Scrape single pages, entire chapter collections or all kandas of the epic
 - Extract Sanskrit verses using selectors or Devanagari character detection
+- Decodes pages with the charset resolved from HTTP headers, <meta> and the bytes
 - Fix encoding issues in Sanskrit text
-- Save output in multiple formats (JSON, CSV, TXT)
+- Save output in multiple formats (JSON, CSV, TXT, JSONL, Parquet, SQLite)
 - Respects robots.txt and implements polite scraping practices
 - Session-based requests with retry logic for improved reliability
+- Concurrent chapter crawling with per-host token-bucket rate limiting
+- Pluggable fetch backends, including an asyncio backend built on aiohttp
+- Fast lxml-based parsing restricted to the elements the extractors need
+- Optional process pool that parses pages while fetching continues
+- Resumable multi-chapter crawls backed by an on-disk manifest
+- On-disk HTTP cache with conditional requests and an offline mode
+- Raw response archive (WARC) for re-running extraction without the network
+- SQLite corpus store with a full-text (FTS5) index and search mode
 
 Usage:
     python web_scraper.py [URL] [options]
@@ -21,27 +30,171 @@ Example:
 """
 
 import argparse
+import asyncio
+import bisect
+import codecs
+import cProfile
 import csv
+import functools
+import gzip
+import hashlib
+import heapq
+import http.client
+import inspect
 import json
 import logging
+import math
 import os
+import pstats
 import random
 import re
+import signal
+import sqlite3
+import sys
+import threading
 import time
-from typing import Dict, List, Optional, Any, Union
-from urllib.parse import urlparse, urljoin
+import tracemalloc
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Any,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlparse, urljoin, urlsplit, urlunsplit
 from urllib.robotparser import RobotFileParser
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer, Tag
+from bs4.builder import builder_registry
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from urllib3.util.retry import Retry
 
+try:
+    import aiohttp
+except ImportError:  # Optional dependency, only needed for the aiohttp backend
+    aiohttp = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional dependency, only needed for Parquet output
+    pyarrow = None
+
+try:
+    import pyinstrument
+except ImportError:  # Optional dependency, only needed for --profile=pyinstrument
+    pyinstrument = None
+
+try:
+    import ijson
+except ImportError:  # Optional dependency, only needed to stream --fix-file JSON
+    ijson = None
+
 
 # Constants
 DEFAULT_TIMEOUT = 10
 MAX_RETRIES = 3
 BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+DEFAULT_WORKERS = 1
+DEFAULT_POOL_SIZE = 10
+# Each worker fetches the frames of a frameset page concurrently
+CONNECTIONS_PER_WORKER = 3
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 2
+ROBOTS_CACHE_TTL = 3600
+DEFAULT_HTTP_CACHE_DIR = ".http_cache"
+DEFAULT_PARSER = "lxml"
+HTML_PARSERS = ["lxml", "html.parser"]
+MANIFEST_FILENAME = "crawl_manifest.jsonl"
+SUMMARY_FILENAME = "scraping_summary.json"
+PARQUET_ROW_GROUP_SIZE = 10000
+SEARCH_LIMIT = 20
+BLOOM_ERROR_RATE = 0.001
+CONTENT_CACHE_SIZE = 1024
+INTERRUPT_MESSAGE = (
+    "Interrupted: finishing the chapters in progress, press Ctrl-C again to abort"
+)
+# Documents smaller than this are parsed inline even with --parse-workers: a
+# process pool round trip costs more than parsing them
+PARSE_INLINE_BYTES = 16 * 1024
+# Upper bounds in seconds of the stage timing histogram buckets
+METRIC_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRIC_NAME = "scraper_stage_duration_seconds"
+PROFILERS = ["cprofile", "pyinstrument", "tracemalloc"]
+# Profile artifacts, written next to scraper.log
+PROFILE_FILES = {
+    "cprofile": "scraper.prof",
+    "pyinstrument": "scraper_profile.html",
+    "tracemalloc": "scraper.tracemalloc",
+}
+PROFILE_TOP = 25
+TRACEMALLOC_FRAMES = 25
+# Trailing verse reference such as "|| १-१-१" or "|| 1.2.3", ignored when
+# comparing verses across chapters
+VERSE_REFERENCE_PATTERN = re.compile(
+    r"[|\u0964\u0965\s]*[0-9\u0966-\u096f]+"
+    r"(?:[-.][0-9\u0966-\u096f]+)*[|\u0964\u0965\s]*$"
+)
+# Link depth of chapter pages below the contents page (depth 0)
+CHAPTER_DEPTH = 1
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# Kanda contents pages are named <kanda>_contents.htm, e.g. /utf8/baala/bala_contents.htm
+KANDA_CONTENTS_PATTERN = re.compile(r"_contents\.html?$", re.IGNORECASE)
+# Sarga pages live at .../<kanda>/sarga<number>/..., e.g. /utf8/baala/sarga1/
+SARGA_URL_PATTERN = re.compile(r"/([^/]+)/sarga(\d+)/")
+# Devanagari (0900-097F), Vedic Extensions (1CD0-1CFF), Devanagari Extended
+# (A8E0-A8FF) and Devanagari Extended-A (11B00-11B5F)
+DEVANAGARI_PATTERN = re.compile(
+    "[\u0900-\u097f\u1cd0-\u1cff\ua8e0-\ua8ff\U00011b00-\U00011b5f]+"
+)
+MIN_DEVANAGARI_RATIO = 0.0
+# Charset resolution: BOMs, the charset parameter of Content-Type, and
+# <meta charset> / <meta http-equiv> declarations in the start of the body
+BYTE_ORDER_MARKS = [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+CONTENT_TYPE_CHARSET_PATTERN = re.compile(
+    r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE
+)
+META_CHARSET_PATTERN = re.compile(
+    rb"<meta[^>]*?charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE
+)
+CHARSET_SNIFF_BYTES = 2048
+# Declared charsets that old pages use for UTF-8 content; a body that is
+# valid UTF-8 is decoded as UTF-8 despite them
+SNIFFED_CHARSETS = {"ascii", "iso8859-1", "cp1252"}
+FALLBACK_CHARSET = "cp1252"
+# Single-byte encodings that UTF-8 pages are commonly mis-decoded with
+MOJIBAKE_ENCODINGS = ("latin-1", "cp1252")
+# A UTF-8 lead byte followed by continuation bytes, as they appear after
+# decoding UTF-8 as Latin-1 or cp1252 (e.g. "à¤•" for "क")
+_CP1252_CONTINUATION = bytes(
+    b for b in range(0x80, 0xA0) if b not in (0x81, 0x8D, 0x8F, 0x90, 0x9D)
+).decode("cp1252")
+MOJIBAKE_PATTERN = re.compile(
+    f"[\xc2-\xf4][\x80-\xbf{re.escape(_CP1252_CONTINUATION)}]"
+)
+# Joins the verses of a document so they can be repaired in one pass
+VERSE_SEPARATOR = "\x00"
+# Indentation of JSON output, as written by save_data()
+JSON_INDENT = " " * 4
+# Only the elements used by extract_sanskrit_verses(), extract_chapter_links()
+# and frameset handling are built; everything else is skipped while parsing.
+PARSE_ONLY = SoupStrainer(["title", "p", "frameset", "frame", "tr", "td", "a"])
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36",
@@ -89,341 +242,3623 @@ class TimeoutHTTPAdapter(HTTPAdapter):
         return super().send(request, **kwargs)
 
 
-def create_session(timeout: int = DEFAULT_TIMEOUT) -> requests.Session:
+class RateLimiter:
     """
-    Create a requests session with retry capabilities and timeout.
-
-    This function creates a session that automatically retries failed requests
-    with exponential backoff, handles timeouts, and sets common headers.
+    Thread-safe per-host token-bucket rate limiter.
 
-    Args:
-        timeout (int, optional): Default timeout in seconds. Defaults to DEFAULT_TIMEOUT.
+    Each host (netloc) gets its own bucket holding up to `burst` tokens that
+    refill at `rate` tokens per second. Every request consumes one token, and
+    a caller only waits when the bucket of its host is empty, so a host is
+    never hit faster than allowed while idle budget is not wasted on sleeps.
 
-    Returns:
-        requests.Session: Configured session object with retry capabilities.
+    Hosts can be given a stricter limit with set_host_rate(), which is how
+    robots.txt Crawl-delay and Request-rate directives are honored.
 
-    Example:
-        >>> session = create_session(timeout=15)
-        >>> response = session.get('https://example.com')
+    Attributes:
+        rate (float): Default refill rate in requests per second. A value of
+            0 or less disables rate limiting for hosts without their own limit.
+        burst (int): Maximum number of requests that may be sent back to back.
     """
-    retry_strategy = Retry(
-        total=MAX_RETRIES,
-        backoff_factor=BACKOFF_FACTOR,
-        status_forcelist=[429, 500, 502, 503, 504],
-    )
-    adapter = TimeoutHTTPAdapter(max_retries=retry_strategy, timeout=timeout)
-    session = requests.Session()
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    session.headers.update(
-        {
-            "Accept": "text/html,application/xhtml+xml,application/xml",
-            "Accept-Language": "en-US,en;q=0.5",
-        }
-    )
-    return session
 
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """
+        Initialize the rate limiter.
 
-def check_robots_txt(url: str, user_agent: str) -> bool:
-    """
-    Check if scraping is allowed according to robots.txt.
+        Args:
+            rate (float, optional): Requests per second per host. Defaults to DEFAULT_RATE.
+            burst (int, optional): Bucket size per host. Defaults to DEFAULT_BURST.
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, List[float]] = {}
+        self._host_limits: Dict[str, Tuple[float, int]] = {}
 
-    Args:
-        url (str): The URL to check for permission to scrape.
-        user_agent (str): User agent to check permissions for.
+    def set_host_rate(self, host: str, rate: float, burst: int = 1) -> None:
+        """
+        Limit a single host to at most the given rate.
 
-    Returns:
-        bool: True if scraping is allowed, False otherwise.
+        The stricter of the default rate and the given rate applies, so a
+        host limit can slow requests down but never speed them up.
 
-    Note:
-        If robots.txt cannot be read or parsed, this function assumes
-        scraping is allowed but logs a warning.
-    """
-    parsed_url = urlparse(url)
-    robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
+        Args:
+            host (str): Network location (host[:port]) to limit.
+            rate (float): Maximum requests per second for the host.
+            burst (int, optional): Bucket size for the host. Defaults to 1.
+        """
+        if rate <= 0:
+            return
+        if self.rate > 0 and self.rate <= rate:
+            rate = self.rate
+        with self._lock:
+            self._host_limits[host] = (rate, max(1, min(burst, self.burst)))
+        logging.info(f"Limiting {host} to {rate:.3g} requests/s")
 
-    rp = RobotFileParser()
-    rp.set_url(robots_url)
+    def reserve(self, url: str) -> float:
+        """
+        Take a token for the host of the given URL.
 
-    try:
-        rp.read()
-        return rp.can_fetch(user_agent, url)
-    except Exception as e:
-        logging.warning(f"Error reading robots.txt: {e}. Assuming scraping is allowed.")
-        return True
+        The token is taken immediately, even when the bucket is empty, so
+        concurrent callers queue up behind each other instead of racing.
 
+        Args:
+            url (str): URL about to be requested.
 
-def extract_sanskrit_verses(soup: BeautifulSoup) -> List[str]:
-    """
-    Extract Sanskrit verses from a BeautifulSoup object.
+        Returns:
+            float: Number of seconds the caller must wait before sending the request.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            rate, burst = self._host_limits.get(host, (self.rate, self.burst))
+            if rate <= 0:
+                return 0.0
 
-    This function attempts to extract Sanskrit verses using a specific CSS selector.
-    If no verses are found, it falls back to searching for paragraphs containing
-    Devanagari characters.
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate) - 1
+            self._buckets[host] = [tokens, now]
 
-    Args:
-        soup (BeautifulSoup): Parsed HTML content to extract verses from.
+        return -tokens / rate if tokens < 0 else 0.0
 
-    Returns:
-        List[str]: List of extracted Sanskrit verses.
+    def acquire(self, url: str) -> None:
+        """
+        Block until a request to the host of the given URL is allowed.
 
-    Note:
-        The function replaces <br> tags with newlines to preserve verse formatting.
-        If no verses are found with the primary selector, it detects text containing
-        Devanagari Unicode characters (0900-097F range).
+        Args:
+            url (str): URL about to be requested.
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            logging.debug(f"Rate limit reached, waiting {delay:.2f}s for {url}")
+            time.sleep(delay)
+
+
+class RateLimitedHTTPAdapter(TimeoutHTTPAdapter):
     """
-    verses = []
+    HTTP adapter that passes every request through a RateLimiter.
 
-    # Try specific selector first
-    elements = soup.select("p.SanSloka")
-    logging.debug(f"Found {len(elements)} elements with selector 'p.SanSloka'")
+    Attributes:
+        rate_limiter (RateLimiter): Limiter consulted before each request.
+    """
 
-    if elements:
-        for element in elements:
-            # Replace <br> tags with newlines
-            for br in element.find_all("br"):
-                br.replace_with("\n")
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the adapter with a rate limiter.
+
+        Args:
+            *args: Variable length argument list passed to TimeoutHTTPAdapter.
+            **kwargs: Arbitrary keyword arguments passed to TimeoutHTTPAdapter.
+                rate_limiter (RateLimiter, optional): Limiter to use. A new
+                    limiter with default settings is created if not provided.
+        """
+        self.rate_limiter = kwargs.pop("rate_limiter", None) or RateLimiter()
+        super().__init__(*args, **kwargs)
 
-            verse_text = element.get_text(strip=True)
-            if verse_text:
-                verses.append(verse_text)
+    def send(self, request, **kwargs):
+        """
+        Wait for the rate limiter, then send the request.
 
-    # If no verses found, look for text with Devanagari characters
-    if not verses:
-        logging.debug("Looking for text containing Devanagari characters")
-        for p in soup.find_all("p"):
-            text = p.get_text(strip=True)
-            # Check for Devanagari Unicode range (0900-097F)
-            if any(0x0900 <= ord(c) <= 0x097F for c in text):
-                for br in p.find_all("br"):
-                    br.replace_with("\n")
-                verses.append(p.get_text(strip=True))
+        Args:
+            request: The prepared request to send.
+            **kwargs: Arbitrary keyword arguments passed to TimeoutHTTPAdapter's send method.
 
-    return verses
+        Returns:
+            requests.Response: The response from the server.
+        """
+        self.rate_limiter.acquire(request.url)
+        return super().send(request, **kwargs)
 
 
-def scrape_webpage(url: str, session: requests.Session) -> Optional[Dict[str, Any]]:
+def make_response(request, status_code: int, headers, body: bytes) -> requests.Response:
     """
-    Scrape a webpage and extract Sanskrit verses.
+    Build a requests Response for a request from stored response data.
 
-    This function handles both modern websites and older sites using framesets.
-    For framed pages, it recursively scrapes each frame for Sanskrit content.
+    Args:
+        request: The prepared request the response answers.
+        status_code (int): HTTP status code.
+        headers: Response headers.
+        body (bytes): Response body.
+
+    Returns:
+        requests.Response: A fully consumed response object.
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = http.client.responses.get(status_code, "")
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = body
+    response._content_consumed = True
+    response.url = request.url
+    response.request = request
+    return response
+
+
+def decoded_headers(headers, body: bytes) -> CaseInsensitiveDict:
+    """
+    Adjust response headers to describe a body that was already decoded.
+
+    requests and aiohttp undo gzip/deflate and chunked transfer encoding, so
+    a stored body must not be served with the original Content-Encoding and
+    Transfer-Encoding headers.
 
     Args:
-        url (str): URL of the webpage to scrape.
-        session (requests.Session): Session object for making HTTP requests.
+        headers: Original response headers.
+        body (bytes): Decoded response body.
 
     Returns:
-        Optional[Dict[str, Any]]: Dictionary with the URL and a list of extracted
-            Sanskrit verses, or None if scraping fails.
-            Format: {'url': str, 'sanskrit_verses': List[str]}
+        CaseInsensitiveDict: Copy of the headers without Content-Encoding and
+            Transfer-Encoding, and with the Content-Length of the body.
+    """
+    headers = CaseInsensitiveDict(headers)
+    for name in ("Content-Encoding", "Transfer-Encoding"):
+        headers.pop(name, None)
+    headers["Content-Length"] = str(len(body))
+    return headers
 
-    Raises:
-        No exceptions are raised; errors are logged and None is returned.
+
+class HTTPCache:
     """
-    try:
-        response = session.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+    Thread-safe on-disk cache of HTTP GET responses.
 
-        logging.debug(
-            f"Page title: {
-                soup.title.string if soup.title else 'No title'}"
-        )
+    Each successful response is stored as a body file plus a JSON metadata
+    file holding the response headers. Cached entries are always revalidated
+    with If-None-Match / If-Modified-Since, so an unchanged page costs a 304
+    response instead of a full download. In offline mode, responses are
+    served from the cache only and the network is never used.
 
-        sanskrit_verses = []
+    Attributes:
+        directory (str): Directory holding the cache files.
+        offline (bool): Whether to serve from the cache without any requests.
+    """
 
-        # Check for framesets (common in older websites)
-        framesets = soup.find_all("frameset")
-        if framesets:
-            logging.info(
-                f"Found {
-                    len(framesets)} framesets - processing frames"
-            )
+    def __init__(self, directory: str = DEFAULT_HTTP_CACHE_DIR, offline: bool = False):
+        """
+        Initialize the cache.
 
-            frames = soup.find_all("frame")
-            for frame in frames:
-                frame_src = frame.get("src")
-                if not frame_src:
-                    continue
+        Args:
+            directory (str, optional): Cache directory, created if missing.
+                Defaults to DEFAULT_HTTP_CACHE_DIR.
+            offline (bool, optional): Serve from the cache only. Defaults to False.
+        """
+        self.directory = directory
+        self.offline = offline
+        os.makedirs(directory, exist_ok=True)
 
-                # Handle relative URLs
-                if not frame_src.startswith("http"):
-                    base_url = "{uri.scheme}://{uri.netloc}{uri.path}".format(
-                        uri=urlparse(url)
-                    )
-                    if not base_url.endswith("/"):
-                        base_url = base_url.rsplit("/", 1)[0] + "/"
-                    frame_src = urljoin(base_url, frame_src)
+    def _paths(self, url: str) -> Tuple[str, str]:
+        """Return the metadata and body file paths for a URL."""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return f"{base}.json", f"{base}.body"
 
-                logging.debug(f"Processing frame: {frame_src}")
+    def load(self, url: str) -> Optional[Tuple[CaseInsensitiveDict, bytes]]:
+        """
+        Load a cached response.
 
-                # Add slight delay between frame requests
-                time.sleep(random.uniform(0.5, 1.5))
+        Args:
+            url (str): URL of the response.
 
-                try:
-                    frame_response = session.get(frame_src)
-                    frame_soup = BeautifulSoup(frame_response.text, "html.parser")
+        Returns:
+            Optional[Tuple[CaseInsensitiveDict, bytes]]: Response headers and body,
+                or None if the URL is not cached.
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        # Entries written by older versions may still carry the encoding headers
+        return decoded_headers(meta["headers"], body), body
+
+    def store(self, url: str, headers, body: bytes) -> None:
+        """
+        Store a response, replacing any previous entry atomically.
 
-                    frame_sanskrit = extract_sanskrit_verses(frame_soup)
-                    if frame_sanskrit:
-                        sanskrit_verses.extend(frame_sanskrit)
-                except Exception as e:
-                    logging.error(f"Error processing frame {frame_src}: {e}")
-        else:
-            # No framesets, process the page directly
-            sanskrit_verses = extract_sanskrit_verses(soup)
+        Args:
+            url (str): URL of the response.
+            headers: Response headers.
+            body (bytes): Decoded response body.
+        """
+        headers = decoded_headers(headers, body)
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        # Write to unique temporary files so concurrent writers never mix entries
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(body_path + suffix, "wb") as f:
+            f.write(body)
+        with open(meta_path + suffix, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "headers": dict(headers)}, f, ensure_ascii=False)
+        os.replace(body_path + suffix, body_path)
+        os.replace(meta_path + suffix, meta_path)
+
+    @staticmethod
+    def validators(headers) -> Dict[str, str]:
+        """
+        Build conditional request headers from cached response headers.
 
-        logging.info(f"Total Sanskrit verses found: {len(sanskrit_verses)}")
-        return {"url": url, "sanskrit_verses": sanskrit_verses}
+        Args:
+            headers: Headers of the cached response.
 
-    except requests.RequestException as e:
-        logging.error(f"Error fetching {url}: {e}")
-        return None
-    except Exception as e:
-        logging.error(f"Error parsing {url}: {e}")
-        return None
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since headers, if available.
+        """
+        conditional = {}
+        if headers.get("ETag"):
+            conditional["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            conditional["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional
 
 
-def fix_encoding(data: Dict[str, Any]) -> Dict[str, Any]:
+class ResponseArchive:
     """
-    Fix encoding issues in Sanskrit verses.
-
-    This function attempts to fix common encoding issues by re-encoding text,
-    which is particularly useful for Sanskrit text that may have been incorrectly
-    encoded or garbled during scraping.
+    Thread-safe append-only archive of raw HTTP responses in WARC format.
 
-    Args:
-        data (Dict[str, Any]): Dictionary containing scraped data with 'sanskrit_verses' key.
+    Every response is written as a WARC/1.0 response record compressed as its
+    own gzip member, so the archive is a regular .warc.gz file. A JSONL index
+    next to it (the archive path plus ".idx") maps each URL to the offset and
+    length of its latest record, so reading a response is a single seek. A
+    response whose body is identical to the latest archived one is skipped.
 
-    Returns:
-        Dict[str, Any]: Dictionary with fixed encoding for Sanskrit verses.
+    Bodies are stored decoded, so Content-Encoding and Transfer-Encoding
+    headers are dropped and Content-Length is rewritten.
 
-    Note:
-        This function preserves the original verse if encoding correction fails.
+    Attributes:
+        path (str): Path of the .warc.gz archive.
+        index_path (str): Path of the JSONL index.
     """
-    if "sanskrit_verses" not in data:
-        logging.warning("No 'sanskrit_verses' key found in data")
-        return data
 
-    fixed_verses = []
-    for verse in data["sanskrit_verses"]:
-        try:
-            # First encode as Latin-1, then decode properly as UTF-8
-            fixed_verse = verse.encode("latin1").decode("utf-8")
-            fixed_verses.append(fixed_verse)
-        except Exception as e:
-            logging.debug(f"Error fixing verse encoding: {e}")
-            # Keep original if there's an error
-            fixed_verses.append(verse)
+    def __init__(self, path: str):
+        """
+        Open an archive, loading its index if it exists.
 
-    # Replace with fixed verses
-    data["sanskrit_verses"] = fixed_verses
-    return data
+        Args:
+            path (str): Path of the .warc.gz archive.
+        """
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Any]] = {}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._index[entry["url"]] = entry
+                    except (ValueError, KeyError):
+                        logging.debug(f"Skipping malformed index line: {line!r}")
+            logging.info(f"Loaded {len(self._index)} archived URLs from {path}")
+
+    def __len__(self) -> int:
+        """Return the number of archived URLs."""
+        return len(self._index)
+
+    def write(self, url: str, status: int, headers, body: bytes) -> None:
+        """
+        Append a response to the archive.
 
+        Args:
+            url (str): Requested URL.
+            status (int): HTTP status code.
+            headers: Response headers.
+            body (bytes): Decoded response body.
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        latest = self._index.get(url)
+        if latest and latest["sha256"] == digest and latest["status"] == status:
+            return
 
-def save_data(data: Dict[str, Any], output_file: str, output_format: str) -> None:
-    """
-    Save data in the specified format (JSON, CSV, or TXT).
+        headers = decoded_headers(headers, body)
+        http_block = (
+            f"HTTP/1.1 {status} {http.client.responses.get(status, '')}\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+            + "\r\n"
+        ).encode("utf-8") + body
+        date = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        warc_headers = (
+            "WARC/1.0\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Date: {date}\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            f"WARC-Payload-Digest: sha256:{digest}\r\n"
+            "Content-Type: application/http; msgtype=response\r\n"
+            f"Content-Length: {len(http_block)}\r\n"
+            "\r\n"
+        ).encode("utf-8")
+        record = gzip.compress(warc_headers + http_block + b"\r\n\r\n")
+
+        with self._lock:
+            with open(self.path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(record)
+            entry = {
+                "url": url,
+                "offset": offset,
+                "length": len(record),
+                "status": status,
+                "sha256": digest,
+                "date": date,
+            }
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._index[url] = entry
+
+    def read(self, url: str) -> Optional[Tuple[int, CaseInsensitiveDict, bytes]]:
+        """
+        Read the latest archived response for a URL.
 
-    Args:
-        data (Dict[str, Any]): Dictionary containing the scraped data.
-        output_file (str): Path where the output file should be saved.
-        output_format (str): Format to save the data in ("json", "csv", or "txt").
+        Args:
+            url (str): Requested URL.
 
-    Note:
-        - Creates any necessary directories in the output path.
-        - For CSV output, flattens the data structure.
-        - For TXT output, formats each verse with a number.
-        - Uses UTF-8 encoding for all output formats.
-    """
-    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        Returns:
+            Optional[Tuple[int, CaseInsensitiveDict, bytes]]: Status code, headers
+                and body, or None if the URL is not archived.
+        """
+        entry = self._index.get(url)
+        if entry is None:
+            return None
 
-    if output_format == "json":
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-    elif output_format == "csv":
-        flattened_data = [
-            {"verse_number": i, "content": verse, "url": data["url"]}
-            for i, verse in enumerate(data.get("sanskrit_verses", []), 1)
-        ]
+        with open(self.path, "rb") as f:
+            f.seek(entry["offset"])
+            record = gzip.decompress(f.read(entry["length"]))
 
-        if flattened_data:
-            with open(output_file, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=flattened_data[0].keys())
-                writer.writeheader()
-                writer.writerows(flattened_data)
-        else:
-            logging.warning("No Sanskrit verses found to save to CSV")
-            return
-    elif output_format == "txt":
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(f"Sanskrit verses from: {data['url']}\n\n")
-            for i, verse in enumerate(data.get("sanskrit_verses", []), 1):
-                f.write(f"Verse {i}:\n{verse}\n\n")
+        warc_head, _, rest = record.partition(b"\r\n\r\n")
+        block_length = int(
+            re.search(rb"(?im)^Content-Length:\s*(\d+)", warc_head).group(1)
+        )
+        http_head, _, body = rest[:block_length].partition(b"\r\n\r\n")
 
-    logging.info(
-        f"Sanskrit verses saved as {
-            output_format.upper()} to {output_file}"
-    )
+        status_line, *header_lines = http_head.decode("utf-8").split("\r\n")
+        headers = CaseInsensitiveDict(
+            line.split(": ", 1) for line in header_lines if ": " in line
+        )
+        return int(status_line.split()[1]), headers, body
 
+    def record_response(self, response: requests.Response, *args, **kwargs) -> None:
+        """
+        requests response hook that archives every response of a session.
 
-def extract_chapter_links(soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
-    """
-    Extract chapter links from a contents page.
+        Args:
+            response (requests.Response): The received response.
+            *args: Unused hook arguments.
+            **kwargs: Unused hook keyword arguments.
+        """
+        try:
+            self.write(
+                response.request.url,
+                response.status_code,
+                response.headers,
+                response.content,
+            )
+        except Exception as e:
+            logging.warning(f"Could not archive {response.url}: {e}")
 
-    This function looks for a table structure containing chapter titles and links.
 
-    Args:
-        soup (BeautifulSoup): Parsed HTML content to extract chapter links from.
-        base_url (str): Base URL for resolving relative URLs.
+class CachingHTTPAdapter(RateLimitedHTTPAdapter):
+    """
+    HTTP adapter that serves and revalidates GET requests through an HTTPCache.
 
-    Returns:
-        List[Dict[str, str]]: List of dictionaries with chapter information.
-            Each dictionary contains:
-            - 'url': The chapter URL (absolute)
-            - 'title': The chapter title (cleaned for use in filenames)
+    Cache lookups happen before rate limiting, so offline requests never wait.
 
-    Note:
-        The function cleans chapter titles by removing leading numbers,
-        special characters, and formatting the text for use in filenames.
+    Attributes:
+        http_cache (Optional[HTTPCache]): Cache to use, or None to disable caching.
     """
-    chapter_links = []
-    rows = soup.find_all("tr")
 
-    for row in rows:
-        cells = row.find_all("td")
-        if len(cells) >= 2:
-            link_cell = cells[1]
-            anchor = link_cell.find("a", href=True)
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the adapter with an HTTP cache.
 
-            if anchor and "href" in anchor.attrs:
-                href = anchor["href"]
+        Args:
+            *args: Variable length argument list passed to RateLimitedHTTPAdapter.
+            **kwargs: Arbitrary keyword arguments passed to RateLimitedHTTPAdapter.
+                http_cache (HTTPCache, optional): Cache to use. Caching is
+                    disabled if not provided.
+        """
+        self.http_cache = kwargs.pop("http_cache", None)
+        super().__init__(*args, **kwargs)
+
+    def _cached_response(self, request, headers, body: bytes) -> requests.Response:
+        """Build a 200 response for a request from a cache entry."""
+        response = make_response(request, 200, headers, body)
+        response.connection = self
+        response.from_cache = True
+        return response
+
+    def send(self, request, **kwargs):
+        """
+        Send a request, answering it from the cache where possible.
+
+        Args:
+            request: The prepared request to send.
+            **kwargs: Arbitrary keyword arguments passed to RateLimitedHTTPAdapter's send method.
+
+        Returns:
+            requests.Response: The response from the server or the cache.
+
+        Raises:
+            requests.ConnectionError: In offline mode, if the URL is not cached.
+        """
+        if self.http_cache is None or request.method != "GET":
+            return super().send(request, **kwargs)
+
+        cached = self.http_cache.load(request.url)
+        if self.http_cache.offline:
+            if cached is None:
+                raise requests.ConnectionError(
+                    f"{request.url} is not in the HTTP cache (offline mode)",
+                    request=request,
+                )
+            return self._cached_response(request, *cached)
+
+        if cached is not None:
+            request.headers.update(HTTPCache.validators(cached[0]))
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            logging.debug(f"Not modified, using cached copy of {request.url}")
+            response.close()
+            return self._cached_response(request, *cached)
+        if response.status_code == 200:
+            self.http_cache.store(request.url, response.headers, response.content)
+        return response
+
+
+class ReplayHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter that answers every request from a ResponseArchive.
+
+    No network connections are made, so replaying is limited only by disk
+    and parsing speed.
+
+    Attributes:
+        archive (ResponseArchive): Archive to replay.
+    """
+
+    def __init__(self, archive: ResponseArchive, *args, **kwargs):
+        """
+        Initialize the adapter.
+
+        Args:
+            archive (ResponseArchive): Archive to replay.
+            *args: Variable length argument list passed to HTTPAdapter.
+            **kwargs: Arbitrary keyword arguments passed to HTTPAdapter.
+        """
+        self.archive = archive
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        """
+        Answer a request from the archive.
+
+        Args:
+            request: The prepared request to answer.
+            **kwargs: Ignored HTTPAdapter send arguments.
+
+        Returns:
+            requests.Response: The archived response.
+
+        Raises:
+            requests.ConnectionError: If the URL is not in the archive.
+        """
+        archived = self.archive.read(request.url)
+        if archived is None:
+            raise requests.ConnectionError(
+                f"{request.url} is not in the archive", request=request
+            )
+        response = make_response(request, *archived)
+        response.connection = self
+        return response
+
+
+def connection_pool_size(workers: int) -> int:
+    """
+    Get the number of connections per host needed by a number of workers.
+
+    Args:
+        workers (int): Number of chapters fetched concurrently.
+
+    Returns:
+        int: Connection pool size, at least DEFAULT_POOL_SIZE.
+    """
+    return max(DEFAULT_POOL_SIZE, workers * CONNECTIONS_PER_WORKER)
+
+
+def create_session(
+    timeout: int = DEFAULT_TIMEOUT,
+    pool_maxsize: int = DEFAULT_POOL_SIZE,
+    rate_limiter: Optional[RateLimiter] = None,
+    http_cache: Optional[HTTPCache] = None,
+    archive: Optional[ResponseArchive] = None,
+) -> requests.Session:
+    """
+    Create a requests session with retry capabilities and timeout.
+
+    This function creates a session that automatically retries failed requests
+    with exponential backoff, handles timeouts, rate-limits requests per host,
+    optionally caches and archives responses on disk, and sets common headers.
+
+    Args:
+        timeout (int, optional): Default timeout in seconds. Defaults to DEFAULT_TIMEOUT.
+        pool_maxsize (int, optional): Maximum number of pooled connections per host.
+            Should be at least the number of concurrent workers. Defaults to
+            DEFAULT_POOL_SIZE.
+        rate_limiter (Optional[RateLimiter], optional): Per-host rate limiter shared
+            by all requests of the session. A limiter with default settings is
+            created if None. Defaults to None.
+        http_cache (Optional[HTTPCache], optional): On-disk HTTP cache for GET
+            requests. Caching is disabled if None. Defaults to None.
+        archive (Optional[ResponseArchive], optional): Archive every response
+            is appended to. Defaults to None.
+
+    Returns:
+        requests.Session: Configured session object with retry capabilities.
+            The limiter is available as its `rate_limiter` attribute, the
+            robots.txt cache as its `robots_cache` attribute, the HTTP cache
+            as its `http_cache` attribute and the archive as its `archive`
+            attribute.
+
+    Example:
+        >>> session = create_session(timeout=15)
+        >>> response = session.get('https://example.com')
+    """
+    retry_strategy = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+    )
+    rate_limiter = rate_limiter or RateLimiter()
+    adapter = CachingHTTPAdapter(
+        max_retries=retry_strategy,
+        timeout=timeout,
+        pool_maxsize=pool_maxsize,
+        rate_limiter=rate_limiter,
+        http_cache=http_cache,
+    )
+    session = requests.Session()
+    session.rate_limiter = rate_limiter
+    session.http_cache = http_cache
+    session.archive = archive
+    session.robots_cache = RobotsCache(session)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if archive is not None:
+        session.hooks["response"].append(archive.record_response)
+    session.headers.update(
+        {
+            "Accept": "text/html,application/xhtml+xml,application/xml",
+            "Accept-Language": "en-US,en;q=0.5",
+        }
+    )
+    return session
+
+
+def create_replay_session(archive: ResponseArchive) -> requests.Session:
+    """
+    Create a session that replays responses from an archive instead of the network.
+
+    Args:
+        archive (ResponseArchive): Archive written by a previous crawl.
+
+    Returns:
+        requests.Session: Session serving every request from the archive,
+            with the same attributes as a session from create_session().
+
+    Example:
+        >>> session = create_replay_session(ResponseArchive('crawl.warc.gz'))
+        >>> data = scrape_webpage('https://example.com/page.htm', session)
+    """
+    adapter = ReplayHTTPAdapter(archive)
+    session = requests.Session()
+    session.rate_limiter = None
+    session.http_cache = None
+    session.archive = None
+    session.robots_cache = RobotsCache(session)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class StageMetrics:
+    """
+    Thread-safe histograms of the time spent in each stage of a crawl.
+
+    Stages are free-form names such as "fetch" or "parse". Every observation
+    is counted in the first bucket whose upper bound it does not exceed, as in
+    Prometheus histograms, so the totals can be exported without keeping the
+    individual timings.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Bucket upper bounds in seconds.
+    """
+
+    def __init__(self, buckets=METRIC_BUCKETS):
+        """
+        Initialize empty histograms.
+
+        Args:
+            buckets (optional): Ascending bucket upper bounds in seconds.
+                Defaults to METRIC_BUCKETS.
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+
+    def _stage(self, stage: str) -> Dict[str, Any]:
+        """Return the histogram of a stage, creating it if needed. Call with the lock held."""
+        if stage not in self._stages:
+            self._stages[stage] = {
+                "count": 0,
+                "sum": 0.0,
+                "max": 0.0,
+                "buckets": [0] * len(self.buckets),
+            }
+        return self._stages[stage]
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """
+        Record one timing.
+
+        Args:
+            stage (str): Name of the stage.
+            seconds (float): Time spent in the stage.
+        """
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._stage(stage)
+            histogram["count"] += 1
+            histogram["sum"] += seconds
+            histogram["max"] = max(histogram["max"], seconds)
+            if index < len(self.buckets):
+                histogram["buckets"][index] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Copy the histograms into plain data, e.g. to send them between processes.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Histograms by stage, see merge().
+        """
+        with self._lock:
+            return {
+                stage: {**histogram, "buckets": list(histogram["buckets"])}
+                for stage, histogram in self._stages.items()
+            }
+
+    def merge(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Add the histograms of a snapshot() taken with the same buckets.
+
+        Args:
+            snapshot (Dict[str, Dict[str, Any]]): Histograms to add.
+        """
+        with self._lock:
+            for stage, other in snapshot.items():
+                histogram = self._stage(stage)
+                histogram["count"] += other["count"]
+                histogram["sum"] += other["sum"]
+                histogram["max"] = max(histogram["max"], other["max"])
+                for i, count in enumerate(other["buckets"]):
+                    histogram["buckets"][i] += count
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize the histograms for scraping_summary.json.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each stage, in name order, the
+                'count', 'total_seconds', 'mean_seconds' and 'max_seconds' of
+                its timings and the cumulative 'buckets' counts keyed by upper
+                bound, ending with "+Inf".
+        """
+        summary = {}
+        for stage, histogram in sorted(self.snapshot().items()):
+            count = histogram["count"]
+            buckets = {}
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, histogram["buckets"]):
+                cumulative += bucket_count
+                buckets[f"{bound:g}"] = cumulative
+            buckets["+Inf"] = count
+            summary[stage] = {
+                "count": count,
+                "total_seconds": round(histogram["sum"], 6),
+                "mean_seconds": round(histogram["sum"] / count, 6) if count else 0.0,
+                "max_seconds": round(histogram["max"], 6),
+                "buckets": buckets,
+            }
+        return summary
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Write the histograms in the Prometheus text exposition format.
+
+        The file is replaced atomically, so it can be picked up by the
+        node_exporter textfile collector while a crawl is running.
+
+        Args:
+            path (str): Output file, conventionally ending in ".prom".
+        """
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each stage of the crawl.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for stage, histogram in self.summary().items():
+            labels = f'stage="{stage}"'
+            for bound, count in histogram["buckets"].items():
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{METRIC_NAME}_sum{{{labels}}} {histogram['total_seconds']}")
+            lines.append(f"{METRIC_NAME}_count{{{labels}}} {histogram['count']}")
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+        logging.info(f"Stage metrics written to {path}")
+
+    def log_summary(self) -> None:
+        """Log the total time and number of timings of each stage."""
+        stages = ", ".join(
+            f"{stage} {histogram['total_seconds']:.2f}s/{histogram['count']}"
+            for stage, histogram in self.summary().items()
+        )
+        if stages:
+            logging.info(f"Stage timings (total/calls): {stages}")
+
+
+_stage_metrics = StageMetrics()
+
+
+def get_stage_metrics() -> StageMetrics:
+    """
+    Return the stage timings recorded by this process.
+
+    Returns:
+        StageMetrics: The process-wide stage histograms.
+    """
+    return _stage_metrics
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Time a block of code as one observation of a stage.
+
+    Args:
+        stage (str): Name of the stage.
+
+    Example:
+        >>> with stage_timer("fetch"):
+        ...     response = session.get(url)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stage_metrics.observe(stage, time.perf_counter() - start)
+
+
+def timed_stage(stage: str) -> Callable:
+    """
+    Decorator timing every call of a function, or coroutine function, as a stage.
+
+    Args:
+        stage (str): Name of the stage.
+
+    Returns:
+        Callable: The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer(stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class RobotsCache:
+    """
+    Thread-safe per-host cache of parsed robots.txt files.
+
+    Each host's robots.txt is downloaded once through the shared session and
+    reused until it is older than `ttl` seconds. Crawl-delay and Request-rate
+    directives are forwarded to the session's rate limiter when one is set.
+
+    Attributes:
+        session (requests.Session): Session used to download robots.txt files.
+        ttl (float): Number of seconds a cached robots.txt stays valid.
+    """
+
+    def __init__(self, session: requests.Session, ttl: float = ROBOTS_CACHE_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            session (requests.Session): Session used to download robots.txt files.
+            ttl (float, optional): Cache lifetime in seconds. Defaults to ROBOTS_CACHE_TTL.
+        """
+        self.session = session
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, Tuple[RobotFileParser, float]] = {}
+
+    def _fetch(self, robots_url: str, user_agent: str) -> RobotFileParser:
+        """
+        Download and parse a robots.txt file.
+
+        Mirrors RobotFileParser.read(): 401/403 disallow everything, other
+        4xx responses allow everything.
+
+        Args:
+            robots_url (str): URL of the robots.txt file.
+            user_agent (str): User agent used to look up crawl delays.
+
+        Returns:
+            RobotFileParser: Parsed robots.txt rules.
+        """
+        rp = RobotFileParser()
+        rp.set_url(robots_url)
+
+        try:
+            response = self.session.get(robots_url)
+            if response.status_code in (401, 403):
+                rp.disallow_all = True
+            elif 400 <= response.status_code < 500:
+                rp.allow_all = True
+            else:
+                response.raise_for_status()
+                rp.parse(response.text.splitlines())
+        except Exception as e:
+            logging.warning(
+                f"Error reading robots.txt: {e}. Assuming scraping is allowed."
+            )
+            rp.allow_all = True
+            return rp
+
+        rate_limiter = getattr(self.session, "rate_limiter", None)
+        if rate_limiter:
+            host = urlparse(robots_url).netloc
+            request_rate = rp.request_rate(user_agent)
+            crawl_delay = rp.crawl_delay(user_agent)
+            if request_rate and request_rate.seconds:
+                rate_limiter.set_host_rate(
+                    host,
+                    request_rate.requests / request_rate.seconds,
+                    burst=request_rate.requests,
+                )
+            elif crawl_delay:
+                rate_limiter.set_host_rate(host, 1 / float(crawl_delay))
+
+        return rp
+
+    def get(self, url: str, user_agent: str) -> RobotFileParser:
+        """
+        Return the parsed robots.txt for the host of the given URL.
+
+        Args:
+            url (str): Any URL on the host.
+            user_agent (str): User agent used to look up crawl delays.
+
+        Returns:
+            RobotFileParser: Cached or freshly downloaded robots.txt rules.
+        """
+        parsed_url = urlparse(url)
+        host = parsed_url.netloc
+
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+
+        # Only one thread downloads a given host's robots.txt
+        with host_lock:
+            entry = self._entries.get(host)
+            if entry and time.monotonic() - entry[1] < self.ttl:
+                return entry[0]
+
+            robots_url = f"{parsed_url.scheme}://{host}/robots.txt"
+            logging.debug(f"Fetching {robots_url}")
+            rp = self._fetch(robots_url, user_agent)
+            self._entries[host] = (rp, time.monotonic())
+            return rp
+
+    def can_fetch(self, url: str, user_agent: str) -> bool:
+        """
+        Check if scraping the given URL is allowed.
+
+        Args:
+            url (str): The URL to check.
+            user_agent (str): User agent to check permissions for.
+
+        Returns:
+            bool: True if scraping is allowed, False otherwise.
+        """
+        return self.get(url, user_agent).can_fetch(user_agent, url)
+
+
+@timed_stage("robots")
+def check_robots_txt(
+    url: str, user_agent: str, session: Optional[requests.Session] = None
+) -> bool:
+    """
+    Check if scraping is allowed according to robots.txt.
+
+    Args:
+        url (str): The URL to check for permission to scrape.
+        user_agent (str): User agent to check permissions for.
+        session (Optional[requests.Session], optional): Session whose robots.txt
+            cache should be used. If None, robots.txt is downloaded with a
+            temporary session and not cached. Defaults to None.
+
+    Returns:
+        bool: True if scraping is allowed, False otherwise.
+
+    Note:
+        If robots.txt cannot be read or parsed, this function assumes
+        scraping is allowed but logs a warning.
+    """
+    robots_cache = getattr(session, "robots_cache", None)
+    if robots_cache is None:
+        robots_cache = RobotsCache(session or requests.Session())
+    return robots_cache.can_fetch(url, user_agent)
+
+
+_html_parser = DEFAULT_PARSER
+
+
+def set_html_parser(parser: str) -> str:
+    """
+    Select the parser backend used by make_soup().
+
+    Args:
+        parser (str): Name of a BeautifulSoup tree builder, e.g. "lxml" or "html.parser".
+
+    Returns:
+        str: The parser actually selected. Falls back to "html.parser" with a
+            warning if the requested parser is not installed.
+    """
+    global _html_parser
+
+    if builder_registry.lookup(parser) is None:
+        logging.warning(f"Parser '{parser}' is not available, using html.parser")
+        parser = "html.parser"
+
+    _html_parser = parser
+    logging.debug(f"Using HTML parser: {parser}")
+    return parser
+
+
+def _codec_name(charset: str) -> Optional[str]:
+    """Return the Python codec name of a charset label, or None if it is unknown."""
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return None
+
+
+def resolve_charset(headers, content: bytes) -> str:
+    """
+    Determine the character encoding of a response body.
+
+    The encoding is taken from, in order, a byte order mark, the charset of
+    the Content-Type header, and a <meta> charset declaration in the first
+    CHARSET_SNIFF_BYTES of the body. If none is given, or the declared
+    charset is ASCII, Latin-1 or cp1252 (SNIFFED_CHARSETS), the body is
+    sniffed: it is UTF-8 if it decodes as UTF-8, otherwise the declared
+    charset or FALLBACK_CHARSET.
+
+    Unlike requests, which assumes ISO-8859-1 for text responses without a
+    charset, this decodes the UTF-8 pages of valmikiramayan.net correctly.
+
+    Args:
+        headers: Response headers (any mapping with a get() method).
+        content (bytes): Raw response body.
+
+    Returns:
+        str: Python codec name, e.g. "utf-8".
+    """
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if content.startswith(bom):
+            return encoding
+
+    charset = None
+    match = CONTENT_TYPE_CHARSET_PATTERN.search(headers.get("Content-Type") or "")
+    if match:
+        charset = _codec_name(match.group(1))
+    if charset is None:
+        match = META_CHARSET_PATTERN.search(content[:CHARSET_SNIFF_BYTES])
+        if match:
+            charset = _codec_name(match.group(1).decode("ascii"))
+    if charset is not None and charset not in SNIFFED_CHARSETS:
+        return charset
+
+    if content.isascii():
+        return charset or "utf-8"
+    try:
+        content.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        return charset or FALLBACK_CHARSET
+
+
+@timed_stage("parse")
+def make_soup(
+    markup: Union[str, bytes], parse_only: bool = True, encoding: Optional[str] = None
+) -> BeautifulSoup:
+    """
+    Parse HTML with the configured parser backend.
+
+    Args:
+        markup (Union[str, bytes]): HTML document to parse. Raw bytes are
+            decoded by the parser itself, which saves decoding them first.
+        parse_only (bool, optional): Restrict the tree to the elements in
+            PARSE_ONLY, which is much faster for large pages. Defaults to True.
+        encoding (Optional[str], optional): Encoding of a bytes document,
+            usually from resolve_charset(). Defaults to None, which lets
+            BeautifulSoup detect it.
+
+    Returns:
+        BeautifulSoup: Parsed HTML content.
+    """
+    return BeautifulSoup(
+        markup,
+        _html_parser,
+        parse_only=PARSE_ONLY if parse_only else None,
+        from_encoding=encoding if isinstance(markup, bytes) else None,
+    )
+
+
+def response_soup(response: requests.Response) -> BeautifulSoup:
+    """
+    Parse the body of a response, decoded with its resolved charset.
+
+    Args:
+        response (requests.Response): Fetched page.
+
+    Returns:
+        BeautifulSoup: Parsed HTML content.
+    """
+    return make_soup(
+        response.content, encoding=resolve_charset(response.headers, response.content)
+    )
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so that equivalent spellings compare equal.
+
+    The scheme and host are lowercased, default ports, user info and the
+    fragment are dropped, and an empty path becomes "/". The path and query
+    are kept as they are, since servers may treat them case-sensitively.
+
+    Args:
+        url (str): Absolute URL.
+
+    Returns:
+        str: Normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set of strings.
+
+    Uses a bit array sized for `capacity` items at the given false-positive
+    rate and double hashing over a BLAKE2b digest. Membership tests never give
+    false negatives; false positives occur at roughly `error_rate` once the
+    filter holds `capacity` items. Memory use does not grow with the number of
+    items, which makes it suitable as the seen-set of very large crawls.
+
+    Attributes:
+        size (int): Number of bits.
+        hash_count (int): Number of bit positions set per item.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        """
+        Allocate the bit array.
+
+        Args:
+            capacity (int): Expected number of items.
+            error_rate (float, optional): Target false-positive rate at capacity.
+                Defaults to BLOOM_ERROR_RATE.
+        """
+        capacity = max(1, capacity)
+        bits_per_item = -math.log(error_rate) / math.log(2) ** 2
+        self.size = max(8, math.ceil(capacity * bits_per_item))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> List[int]:
+        """Get the bit positions of an item."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        """
+        Add an item to the filter.
+
+        Args:
+            item (str): Item to add.
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class FrontierEntry(NamedTuple):
+    """A URL queued in a CrawlFrontier, ordered by (priority, order)."""
+
+    priority: float
+    order: int
+    depth: int
+    url: str
+    info: Any
+
+
+class CrawlFrontier:
+    """
+    Thread-safe crawl frontier: a priority queue of URLs plus a seen-set.
+
+    Every URL is normalized with normalize_url() and claimed at most once per
+    frontier, either by queueing it with add() or by fetching it right away
+    after visit(), so a URL reachable along several paths (e.g. a navigation
+    frame shared by all sarga pages) is only fetched once per crawl. URLs
+    deeper than max_depth are refused. Queued URLs are popped lowest priority
+    first and in insertion order among equal priorities; the default priority
+    is the depth, which gives a breadth-first crawl.
+
+    Attributes:
+        max_depth (Optional[int]): Maximum link depth, None for no limit. The
+            start page of a crawl has depth 0.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None, bloom_capacity: int = 0):
+        """
+        Initialize an empty frontier.
+
+        Args:
+            max_depth (Optional[int], optional): Maximum link depth. Defaults to None.
+            bloom_capacity (int, optional): If positive, track seen URLs in a
+                BloomFilter sized for this many URLs instead of an exact set.
+                This bounds memory for large crawls at the cost of rarely
+                skipping a URL that was never seen. Defaults to 0.
+        """
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._heap: List[FrontierEntry] = []
+        self._order = 0
+        self._seen: Any = BloomFilter(bloom_capacity) if bloom_capacity > 0 else set()
+        self.seen_count = 0
+
+    def _claim(self, url: str, depth: int) -> bool:
+        """Mark a URL as seen if it is new and not too deep. Caller holds the lock."""
+        if not self.within_depth(depth):
+            logging.debug(f"Not crawling {url}: depth {depth} > {self.max_depth}")
+            return False
+        key = normalize_url(url)
+        if key in self._seen:
+            logging.debug(f"Not crawling {url}: already seen")
+            return False
+        self._seen.add(key)
+        self.seen_count += 1
+        return True
+
+    def add(
+        self,
+        url: str,
+        depth: int = 0,
+        priority: Optional[float] = None,
+        info: Any = None,
+    ) -> bool:
+        """
+        Queue a URL unless it was seen before or is too deep.
+
+        Args:
+            url (str): Absolute URL.
+            depth (int, optional): Link depth of the URL. Defaults to 0.
+            priority (Optional[float], optional): Lower values are popped first.
+                Defaults to None, which uses the depth.
+            info (Any, optional): Data returned with the entry by pop().
+                Defaults to None.
+
+        Returns:
+            bool: True if the URL was queued.
+        """
+        with self._lock:
+            if not self._claim(url, depth):
+                return False
+            priority = depth if priority is None else priority
+            heapq.heappush(
+                self._heap, FrontierEntry(priority, self._order, depth, url, info)
+            )
+            self._order += 1
+            return True
+
+    def within_depth(self, depth: int) -> bool:
+        """
+        Check whether pages at a link depth may be crawled.
+
+        Args:
+            depth (int): Link depth.
+
+        Returns:
+            bool: True if the depth does not exceed max_depth.
+        """
+        return self.max_depth is None or depth <= self.max_depth
+
+    def visit(self, url: str, depth: int = 0) -> bool:
+        """
+        Claim a URL that the caller fetches right away, without queueing it.
+
+        Args:
+            url (str): Absolute URL.
+            depth (int, optional): Link depth of the URL. Defaults to 0.
+
+        Returns:
+            bool: True if the URL should be fetched, False if it was seen
+                before or is too deep.
+        """
+        with self._lock:
+            return self._claim(url, depth)
+
+    def pop(self) -> Optional[FrontierEntry]:
+        """
+        Remove and return the queued URL with the lowest priority.
+
+        Returns:
+            Optional[FrontierEntry]: The entry, or None if the queue is empty.
+        """
+        with self._lock:
+            return heapq.heappop(self._heap) if self._heap else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+
+class ContentCache:
+    """
+    Thread-safe, content-addressed cache of the verses parsed from frames.
+
+    Frames are looked up by URL first: the first page to need a frame claims
+    it and fetches it, and every other page, in any thread or event loop,
+    waits for that result instead of fetching the frame again. Parsed verses
+    are also stored by the SHA-256 of the frame body, so frames served under
+    different URLs with identical content are parsed only once. Both maps
+    keep the most recently used CONTENT_CACHE_SIZE entries. Only successful
+    parses are cached: a claim whose frame fails is released, so the frame
+    is fetched again by the next page that needs it.
+
+    Attributes:
+        hits (int): Number of frames served from the cache.
+        parses_saved (int): Number of fetched frames that were not parsed
+            because a frame with the same body had been parsed before.
+    """
+
+    def __init__(self, max_entries: int = CONTENT_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int, optional): Maximum number of URLs and of bodies
+                kept. Defaults to CONTENT_CACHE_SIZE.
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._by_url: "OrderedDict[str, Future]" = OrderedDict()
+        self._by_hash: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.hits = 0
+        self.parses_saved = 0
+
+    def _remember(self, cache: OrderedDict, key: str, value: Any) -> None:
+        """Store an entry, evicting the least recently used. Caller holds the lock."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.max_entries:
+            cache.popitem(last=False)
+
+    def claim(self, url: str) -> Tuple[Future, bool]:
+        """
+        Get the future holding the verses of a frame URL.
+
+        Args:
+            url (str): Absolute frame URL.
+
+        Returns:
+            Tuple[Future, bool]: The future, and True if the caller claimed the
+                URL and must fetch the frame and complete the future with
+                set_result(), or release() it and complete the future with
+                set_exception() on failure. False if it only has to wait for
+                the result.
+        """
+        key = normalize_url(url)
+        with self._lock:
+            future = self._by_url.get(key)
+            if future is not None:
+                self._by_url.move_to_end(key)
+                self.hits += 1
+                return future, False
+            future = Future()
+            self._remember(self._by_url, key, future)
+            return future, True
+
+    def release(self, url: str) -> None:
+        """
+        Drop the claim on a frame URL whose fetch or parse failed.
+
+        Args:
+            url (str): Absolute frame URL passed to claim().
+        """
+        with self._lock:
+            self._by_url.pop(normalize_url(url), None)
+
+    def parsed(self, body: bytes) -> Tuple[str, Optional[List[str]]]:
+        """
+        Look up the verses parsed from a frame body.
+
+        Args:
+            body (bytes): Raw frame body.
+
+        Returns:
+            Tuple[str, Optional[List[str]]]: SHA-256 hex digest of the body, and
+                the verses parsed from an identical body, or None.
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            verses = self._by_hash.get(digest)
+            if verses is not None:
+                self._by_hash.move_to_end(digest)
+                self.parses_saved += 1
+            return digest, verses
+
+    def store(self, digest: str, verses: List[str]) -> None:
+        """
+        Store the verses parsed from a frame body.
+
+        Args:
+            digest (str): SHA-256 hex digest of the body, from parsed().
+            verses (List[str]): Verses parsed from the body.
+        """
+        with self._lock:
+            self._remember(self._by_hash, digest, verses)
+
+
+class FetchError(Exception):
+    """Raised by fetch backends when a page cannot be downloaded."""
+
+
+class FetchResult(NamedTuple):
+    """
+    Backend-independent result of fetching a URL.
+
+    Attributes:
+        url (str): Final URL of the response, after redirects.
+        status (int): HTTP status code.
+        headers (CaseInsensitiveDict): Response headers.
+        content (bytes): Raw response body.
+        encoding (str): Encoding of the body, see resolve_charset().
+    """
+
+    url: str
+    status: int
+    headers: CaseInsensitiveDict
+    content: bytes
+    encoding: str
+
+    @property
+    def text(self) -> str:
+        """str: Response body decoded with its encoding."""
+        return self.content.decode(self.encoding, errors="replace")
+
+
+class SessionFetcher:
+    """
+    Async fetch backend built on a requests session.
+
+    Each request runs in a worker thread, so the session's retries, timeouts,
+    rate limiting and connection pool all apply unchanged.
+
+    Attributes:
+        session (requests.Session): Session used for all requests.
+    """
+
+    def __init__(self, session: requests.Session):
+        """
+        Initialize the fetcher.
+
+        Args:
+            session (requests.Session): Session used for all requests.
+        """
+        self.session = session
+
+    @timed_stage("fetch")
+    async def fetch(self, url: str) -> FetchResult:
+        """
+        Fetch a URL.
+
+        Args:
+            url (str): URL to fetch.
+
+        Returns:
+            FetchResult: The response.
+
+        Raises:
+            FetchError: If the request fails or returns an error status.
+        """
+        try:
+            response = await asyncio.to_thread(self.session.get, url)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise FetchError(str(e)) from e
+
+        return FetchResult(
+            url=response.url,
+            status=response.status_code,
+            headers=response.headers,
+            content=response.content,
+            encoding=resolve_charset(response.headers, response.content),
+        )
+
+    async def close(self) -> None:
+        """Release backend resources. The session is owned by the caller."""
+
+
+class AiohttpFetcher:
+    """
+    Async fetch backend built on aiohttp.
+
+    All requests share one aiohttp session whose keep-alive connection pool is
+    bounded by `limit`, so many fetches can be in flight on a single thread.
+    Requests go through the same per-host rate limiter and HTTP cache as the
+    requests session and are retried with exponential backoff like
+    create_session().
+
+    Attributes:
+        headers (Dict[str, str]): Headers sent with every request.
+        rate_limiter (Optional[RateLimiter]): Per-host rate limiter.
+        http_cache (Optional[HTTPCache]): On-disk HTTP cache.
+        archive (Optional[ResponseArchive]): Archive every response is appended to.
+        timeout (int): Total timeout per request in seconds.
+        limit (int): Maximum number of open connections.
+    """
+
+    def __init__(
+        self,
+        headers: Dict[str, str],
+        rate_limiter: Optional[RateLimiter] = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        limit: int = DEFAULT_POOL_SIZE,
+        http_cache: Optional[HTTPCache] = None,
+        archive: Optional[ResponseArchive] = None,
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            headers (Dict[str, str]): Headers sent with every request.
+            rate_limiter (Optional[RateLimiter], optional): Per-host rate limiter.
+                Defaults to None.
+            timeout (int, optional): Timeout per request in seconds. Defaults to DEFAULT_TIMEOUT.
+            limit (int, optional): Maximum number of open connections.
+                Defaults to DEFAULT_POOL_SIZE.
+            http_cache (Optional[HTTPCache], optional): On-disk HTTP cache.
+                Defaults to None.
+            archive (Optional[ResponseArchive], optional): Archive every
+                response is appended to. Defaults to None.
+
+        Raises:
+            ImportError: If aiohttp is not installed.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "The aiohttp backend requires aiohttp (pip install aiohttp)"
+            )
+        self.headers = headers
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.limit = limit
+        self.http_cache = http_cache
+        self.archive = archive
+        self._session = None
+
+    @classmethod
+    def from_session(
+        cls, session: requests.Session, limit: int = DEFAULT_POOL_SIZE
+    ) -> "AiohttpFetcher":
+        """
+        Create a fetcher sharing headers, rate limiter, HTTP cache and archive
+        with a requests session.
+
+        Args:
+            session (requests.Session): Session created by create_session().
+            limit (int, optional): Maximum number of open connections.
+                Defaults to DEFAULT_POOL_SIZE.
+
+        Returns:
+            AiohttpFetcher: The new fetcher.
+        """
+        return cls(
+            dict(session.headers),
+            rate_limiter=getattr(session, "rate_limiter", None),
+            limit=limit,
+            http_cache=getattr(session, "http_cache", None),
+            archive=getattr(session, "archive", None),
+        )
+
+    def _get_session(self):
+        """Create the aiohttp session on first use, inside the running loop."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.limit),
+            )
+        return self._session
+
+    @timed_stage("fetch")
+    async def fetch(self, url: str) -> FetchResult:
+        """
+        Fetch a URL, retrying transient failures.
+
+        Args:
+            url (str): URL to fetch.
+
+        Returns:
+            FetchResult: The response.
+
+        Raises:
+            FetchError: If the request fails or returns an error status.
+        """
+        result = await self._fetch(url)
+        if self.archive is not None:
+            self.archive.write(url, result.status, result.headers, result.content)
+        return result
+
+    async def _fetch(self, url: str) -> FetchResult:
+        """Fetch a URL through the HTTP cache, retrying transient failures."""
+        cached = self.http_cache.load(url) if self.http_cache else None
+        if self.http_cache and self.http_cache.offline:
+            if cached is None:
+                raise FetchError(f"{url} is not in the HTTP cache (offline mode)")
+            return self._result(url, 200, *cached)
+
+        request_headers = HTTPCache.validators(cached[0]) if cached else {}
+        session = self._get_session()
+
+        for attempt in range(MAX_RETRIES + 1):
+            if self.rate_limiter:
+                delay = self.rate_limiter.reserve(url)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            try:
+                async with session.get(url, headers=request_headers) as response:
+                    content = await response.read()
+                    if response.status == 304 and cached:
+                        logging.debug(f"Not modified, using cached copy of {url}")
+                        return self._result(url, 200, *cached)
+                    if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                        error = f"{response.status} for url: {url}"
+                    elif response.status >= 400:
+                        raise FetchError(f"{response.status} Error for url: {url}")
+                    else:
+                        headers = CaseInsensitiveDict(response.headers)
+                        if self.http_cache and response.status == 200:
+                            self.http_cache.store(url, headers, content)
+                        return self._result(
+                            str(response.url), response.status, headers, content
+                        )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == MAX_RETRIES:
+                    raise FetchError(f"{type(e).__name__}: {e}") from e
+                error = str(e)
+
+            backoff = BACKOFF_FACTOR * (2**attempt)
+            logging.debug(f"Retrying {url} in {backoff:.2f}s after error: {error}")
+            await asyncio.sleep(backoff)
+
+        raise FetchError(f"Max retries exceeded for url: {url}")
+
+    @staticmethod
+    def _result(
+        url: str, status: int, headers: CaseInsensitiveDict, content: bytes
+    ) -> FetchResult:
+        """Build a FetchResult, resolving the charset like SessionFetcher."""
+        return FetchResult(
+            url=url,
+            status=status,
+            headers=headers,
+            content=content,
+            encoding=resolve_charset(headers, content),
+        )
+
+    async def close(self) -> None:
+        """Close the aiohttp session and its connection pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+# Fetch backends by name; each factory takes the shared requests session and
+# the maximum number of concurrent connections.
+FETCH_BACKENDS: Dict[str, Callable[[requests.Session, int], Any]] = {
+    "requests": lambda session, limit: SessionFetcher(session),
+    "aiohttp": AiohttpFetcher.from_session,
+}
+
+
+def create_fetcher(
+    backend: str, session: requests.Session, limit: int = DEFAULT_POOL_SIZE
+):
+    """
+    Create an async fetcher for the named backend.
+
+    Args:
+        backend (str): Name of a backend registered in FETCH_BACKENDS.
+        session (requests.Session): Shared session created by create_session().
+        limit (int, optional): Maximum number of concurrent connections.
+            Defaults to DEFAULT_POOL_SIZE.
+
+    Returns:
+        An object with async fetch(url) and close() methods.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend not in FETCH_BACKENDS:
+        raise ValueError(f"Unknown fetch backend: {backend}")
+    return FETCH_BACKENDS[backend](session, limit)
+
+
+def is_devanagari_text(text: str, min_ratio: float = MIN_DEVANAGARI_RATIO) -> bool:
+    """
+    Check whether a text is written in Devanagari.
+
+    Detection runs in precompiled regular expressions instead of a Python
+    loop over every character.
+
+    Args:
+        text (str): Text to check.
+        min_ratio (float, optional): Minimum share of Devanagari characters among
+            the non-whitespace characters. With 0, a single Devanagari character
+            is enough. Defaults to MIN_DEVANAGARI_RATIO.
+
+    Returns:
+        bool: True if the text contains enough Devanagari characters.
+    """
+    if DEVANAGARI_PATTERN.search(text) is None:
+        return False
+    if min_ratio <= 0:
+        return True
+
+    visible = len("".join(text.split()))
+    devanagari = sum(map(len, DEVANAGARI_PATTERN.findall(text)))
+    return devanagari / visible >= min_ratio
+
+
+def get_verse_text(element: Tag) -> str:
+    """
+    Get the text of an element with <br> tags turned into newlines.
+
+    The element's descendants are walked once and the tree is not modified,
+    so the same soup can be extracted from again. Like get_text(strip=True),
+    every text node is stripped and empty ones are skipped.
+
+    Args:
+        element (Tag): Element to get the text of.
+
+    Returns:
+        str: Text of the element, one line per <br>-separated line.
+    """
+    parts = []
+    for node in element.descendants:
+        if isinstance(node, Tag):
+            if node.name == "br":
+                parts.append("\n")
+        elif type(node) is NavigableString or isinstance(node, CData):
+            text = node.strip()
+            if text:
+                parts.append(text)
+    return "".join(parts).strip()
+
+
+@timed_stage("extract")
+def extract_sanskrit_verses(
+    soup: BeautifulSoup, min_devanagari_ratio: float = MIN_DEVANAGARI_RATIO
+) -> List[str]:
+    """
+    Extract Sanskrit verses from a BeautifulSoup object.
+
+    This function attempts to extract Sanskrit verses using a specific CSS selector.
+    If no verses are found, it falls back to searching for paragraphs containing
+    Devanagari characters.
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML content to extract verses from.
+        min_devanagari_ratio (float, optional): Minimum share of Devanagari
+            characters for a paragraph to count as a verse in the fallback
+            search, see is_devanagari_text(). Defaults to MIN_DEVANAGARI_RATIO.
+
+    Returns:
+        List[str]: List of extracted Sanskrit verses.
+
+    Note:
+        <br> tags become newlines to preserve verse formatting, without
+        modifying the soup (see get_verse_text()). If no verses are found
+        with the primary selector, it detects text containing Devanagari
+        Unicode characters, including the Vedic Extensions and Devanagari
+        Extended blocks.
+    """
+    verses = []
+
+    # Try specific selector first
+    elements = soup.select("p.SanSloka")
+    logging.debug(f"Found {len(elements)} elements with selector 'p.SanSloka'")
+
+    for element in elements:
+        verse_text = get_verse_text(element)
+        if verse_text:
+            verses.append(verse_text)
+
+    # If no verses found, look for text with Devanagari characters
+    if not verses:
+        logging.debug("Looking for text containing Devanagari characters")
+        for p in soup.find_all("p"):
+            text = get_verse_text(p)
+            if is_devanagari_text(text, min_devanagari_ratio):
+                verses.append(text)
+
+    return verses
+
+
+def get_frame_urls(soup: BeautifulSoup, url: str) -> List[str]:
+    """
+    Get the absolute URLs of all frames of a frameset page, in document order.
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML content of the frameset page.
+        url (str): URL of the frameset page, used to resolve relative URLs.
+
+    Returns:
+        List[str]: Absolute frame URLs.
+    """
+    frame_urls = []
+    for frame in soup.find_all("frame"):
+        frame_src = frame.get("src")
+        if not frame_src:
+            continue
+
+        # Handle relative URLs
+        if not frame_src.startswith("http"):
+            base_url = "{uri.scheme}://{uri.netloc}{uri.path}".format(uri=urlparse(url))
+            if not base_url.endswith("/"):
+                base_url = base_url.rsplit("/", 1)[0] + "/"
+            frame_src = urljoin(base_url, frame_src)
+
+        frame_urls.append(frame_src)
+
+    return frame_urls
+
+
+def parse_page(
+    markup: Union[str, bytes], url: str, encoding: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Parse a fetched page and extract its frames or Sanskrit verses.
+
+    This is the CPU-bound half of scraping. It only takes and returns plain
+    data, so it can run in a worker process.
+
+    Args:
+        markup (Union[str, bytes]): HTML document of the page.
+        url (str): URL of the page, used to resolve relative frame URLs.
+        encoding (Optional[str], optional): Encoding of a bytes document.
+            Defaults to None, which lets the parser detect it.
+
+    Returns:
+        Dict[str, Any]: Dictionary with the page title, the number of framesets,
+            the absolute frame URLs and the verses found directly on the page.
+            Format: {'title': str, 'framesets': int, 'frame_urls': List[str],
+            'sanskrit_verses': List[str]}
+    """
+    soup = make_soup(markup, encoding=encoding)
+    framesets = len(soup.find_all("frameset"))
+    return {
+        "title": soup.title.string if soup.title else "No title",
+        "framesets": framesets,
+        "frame_urls": get_frame_urls(soup, url) if framesets else [],
+        # Pages with framesets keep their content in the frames
+        "sanskrit_verses": [] if framesets else extract_sanskrit_verses(soup),
+    }
+
+
+def parse_verses(
+    markup: Union[str, bytes], encoding: Optional[str] = None
+) -> List[str]:
+    """
+    Parse a fetched frame and extract its Sanskrit verses.
+
+    Like parse_page(), this can run in a worker process.
+
+    Args:
+        markup (Union[str, bytes]): HTML document of the frame.
+        encoding (Optional[str], optional): Encoding of a bytes document.
+            Defaults to None, which lets the parser detect it.
+
+    Returns:
+        List[str]: Extracted Sanskrit verses.
+    """
+    return extract_sanskrit_verses(make_soup(markup, encoding=encoding))
+
+
+def parse_frames(frames: List[Tuple[bytes, str]]) -> List[Optional[List[str]]]:
+    """
+    Parse the fetched frames of a page and extract their Sanskrit verses.
+
+    Batches parse_verses() so that all frames of a page cost a single process
+    pool round trip.
+
+    Args:
+        frames (List[Tuple[bytes, str]]): Body and encoding of each frame.
+
+    Returns:
+        List[Optional[List[str]]]: Extracted verses of each frame, in order,
+            or None for a frame that could not be parsed.
+    """
+    results = []
+    for content, encoding in frames:
+        try:
+            results.append(parse_verses(content, encoding))
+        except Exception as e:
+            logging.error(f"Error parsing frame: {e}")
+            results.append(None)
+    return results
+
+
+def create_parse_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Create a process pool for parse_page() and parse_frames().
+
+    Worker processes are initialized with the parser backend selected in
+    this process.
+
+    Args:
+        workers (int): Number of parser processes.
+
+    Returns:
+        ProcessPoolExecutor: The process pool.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=set_html_parser, initargs=(_html_parser,)
+    )
+
+
+def _parse_with_metrics(func: Callable, *args) -> Tuple[Any, Dict[str, Dict[str, Any]]]:
+    """
+    Run a parse function in a worker process and collect its stage timings.
+
+    Args:
+        func (Callable): parse_page() or parse_frames().
+        *args: Arguments for the parse function.
+
+    Returns:
+        Tuple[Any, Dict[str, Dict[str, Any]]]: The return value of the parse
+            function and a StageMetrics snapshot of the timings it recorded,
+            to be merged into the metrics of the parent process.
+    """
+    global _stage_metrics
+
+    previous, _stage_metrics = _stage_metrics, StageMetrics()
+    try:
+        result = func(*args)
+        return result, _stage_metrics.snapshot()
+    finally:
+        _stage_metrics = previous
+
+
+async def _run_parser(
+    parse_executor: Optional[Executor], size: int, func: Callable, *args
+):
+    """
+    Run a parse function in the executor, or inline if there is none.
+
+    Documents smaller than PARSE_INLINE_BYTES are always parsed inline, as
+    handing them to a worker process costs more than parsing them.
+
+    Args:
+        parse_executor (Optional[Executor]): Executor to run the parser in.
+        size (int): Number of bytes to be parsed.
+        func (Callable): parse_page() or parse_frames().
+        *args: Arguments for the parse function.
+
+    Returns:
+        The return value of the parse function.
+    """
+    if parse_executor is None or size < PARSE_INLINE_BYTES:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    result, metrics = await loop.run_in_executor(
+        parse_executor, _parse_with_metrics, func, *args
+    )
+    _stage_metrics.merge(metrics)
+    return result
+
+
+async def _scrape_frames(
+    frame_urls: List[str],
+    fetcher,
+    parse_executor: Optional[Executor] = None,
+    content_cache: Optional[ContentCache] = None,
+) -> List[List[str]]:
+    """
+    Fetch the frames of a page and extract their Sanskrit verses.
+
+    All frames are fetched concurrently and the frames that still need parsing
+    are parsed together, in a single parse_frames() job.
+
+    Args:
+        frame_urls (List[str]): Absolute URLs of the frames.
+        fetcher: Async fetch backend, see create_fetcher().
+        parse_executor (Optional[Executor], optional): Executor to parse in.
+            Defaults to None, which parses inline.
+        content_cache (Optional[ContentCache], optional): Cache of parsed frames
+            shared by the pages of a crawl. Defaults to None.
+
+    Returns:
+        List[List[str]]: Extracted verses of each frame, in frame order. Frames
+            that fail contribute an empty list.
+    """
+    verses: List[Optional[List[str]]] = [None] * len(frame_urls)
+    claimed: Dict[int, Future] = {}
+    waiting: Dict[int, Future] = {}
+    if content_cache is not None:
+        for i, frame_src in enumerate(frame_urls):
+            future, claim = content_cache.claim(frame_src)
+            (claimed if claim else waiting)[i] = future
+    fetched = [i for i in range(len(frame_urls)) if i not in waiting]
+
+    try:
+        for i in fetched:
+            logging.debug(f"Processing frame: {frame_urls[i]}")
+        responses = await asyncio.gather(
+            *(fetcher.fetch(frame_urls[i]) for i in fetched), return_exceptions=True
+        )
+
+        to_parse = []
+        for i, response in zip(fetched, responses):
+            if isinstance(response, BaseException):
+                logging.error(f"Error processing frame {frame_urls[i]}: {response}")
+                continue
+            digest, cached = None, None
+            if content_cache is not None:
+                digest, cached = content_cache.parsed(response.content)
+            if cached is not None:
+                logging.debug(f"Frame {frame_urls[i]} matches a parsed frame body")
+                verses[i] = cached
+            else:
+                to_parse.append((i, digest, response))
+
+        if to_parse:
+            parsed = await _run_parser(
+                parse_executor,
+                sum(len(response.content) for _, _, response in to_parse),
+                parse_frames,
+                [(response.content, response.encoding) for _, _, response in to_parse],
+            )
+            for (i, digest, _), frame_verses in zip(to_parse, parsed):
+                verses[i] = frame_verses
+                if digest is not None and frame_verses is not None:
+                    content_cache.store(digest, frame_verses)
+    except Exception as e:
+        logging.error(f"Error processing frames: {e}")
+    finally:
+        # Waiters must never hang. A failure is not cached: the claim is
+        # released and waiters fall back to fetching the frame themselves.
+        for i, future in claimed.items():
+            if verses[i] is None:
+                content_cache.release(frame_urls[i])
+                future.set_exception(FetchError(f"Frame {frame_urls[i]} failed"))
+            else:
+                future.set_result(verses[i])
+
+    async def wait(i: int, future: Future) -> None:
+        logging.debug(f"Reusing cached frame: {frame_urls[i]}")
+        try:
+            verses[i] = await asyncio.wrap_future(future)
+        except FetchError:
+            # The claim was released, so this claims the frame again or
+            # waits for another page that already did
+            logging.debug(f"Shared frame {frame_urls[i]} failed, fetching it again")
+            [verses[i]] = await _scrape_frames(
+                [frame_urls[i]], fetcher, parse_executor, content_cache
+            )
+
+    await asyncio.gather(*(wait(i, future) for i, future in waiting.items()))
+    return [list(frame_verses or []) for frame_verses in verses]
+
+
+async def scrape_webpage_async(
+    url: str,
+    fetcher,
+    parse_executor: Optional[Executor] = None,
+    frontier: Optional[CrawlFrontier] = None,
+    depth: int = 0,
+    content_cache: Optional[ContentCache] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Scrape a webpage and extract Sanskrit verses using an async fetcher.
+
+    This function handles both modern websites and older sites using framesets.
+    For framed pages, all frames are fetched concurrently (subject to the
+    per-host rate limit) and their verses are merged in frame order.
+
+    Args:
+        url (str): URL of the webpage to scrape.
+        fetcher: Async fetch backend, see create_fetcher().
+        parse_executor (Optional[Executor], optional): Executor, typically from
+            create_parse_executor(), that fetched pages are handed to for
+            parsing, so parsing never blocks fetching. Defaults to None, which
+            parses inline.
+        frontier (Optional[CrawlFrontier], optional): Frontier of the crawl the
+            page belongs to. Frames that the frontier has already seen, or that
+            are deeper than its max_depth, are not fetched. Defaults to None,
+            which fetches all frames.
+        depth (int, optional): Link depth of the page in the crawl; its frames
+            are one level deeper. Defaults to 0.
+        content_cache (Optional[ContentCache], optional): Cache of parsed frames
+            shared by the pages of a crawl. Frames the frontier has already
+            seen are then served from the cache instead of being skipped, so
+            a frame shared by several pages contributes its verses to each.
+            Defaults to None.
+
+    Returns:
+        Optional[Dict[str, Any]]: Dictionary with the URL and a list of extracted
+            Sanskrit verses, or None if scraping fails.
+            Format: {'url': str, 'sanskrit_verses': List[str]}
+
+    Raises:
+        No exceptions are raised; errors are logged and None is returned.
+    """
+    try:
+        response = await fetcher.fetch(url)
+        page = await _run_parser(
+            parse_executor,
+            len(response.content),
+            parse_page,
+            response.content,
+            url,
+            response.encoding,
+        )
+
+        logging.debug(f"Page title: {page['title']}")
+
+        sanskrit_verses = page["sanskrit_verses"]
+
+        # Check for framesets (common in older websites)
+        if page["framesets"]:
+            logging.info(
+                f"Found {
+                    page['framesets']} framesets - processing frames"
+            )
+
+            frame_urls = page["frame_urls"]
+            if frontier is not None:
+                # visit() records every frame as seen; frames seen before are
+                # only kept if the content cache can serve them
+                frame_urls = [
+                    frame_src
+                    for frame_src in frame_urls
+                    if frontier.visit(frame_src, depth + 1)
+                    or (content_cache is not None and frontier.within_depth(depth + 1))
+                ]
+
+            frame_results = await _scrape_frames(
+                frame_urls, fetcher, parse_executor, content_cache
+            )
+            for frame_sanskrit in frame_results:
+                sanskrit_verses.extend(frame_sanskrit)
+
+        logging.info(f"Total Sanskrit verses found: {len(sanskrit_verses)}")
+        return {"url": url, "sanskrit_verses": sanskrit_verses}
+
+    except FetchError as e:
+        logging.error(f"Error fetching {url}: {e}")
+        return None
+    except Exception as e:
+        logging.error(f"Error parsing {url}: {e}")
+        return None
+
+
+_thread_state = threading.local()
+_thread_loops: List[asyncio.AbstractEventLoop] = []
+_thread_loops_lock = threading.Lock()
+
+
+def run_coroutine(coro: Awaitable) -> Any:
+    """
+    Run a coroutine on the event loop of the calling thread.
+
+    Unlike asyncio.run(), the loop, and the default executor that
+    SessionFetcher runs requests in, are created once per thread and reused by
+    every call, instead of being set up and torn down for each chapter.
+
+    Args:
+        coro (Awaitable): Coroutine to run.
+
+    Returns:
+        Any: The return value of the coroutine.
+    """
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+        with _thread_loops_lock:
+            _thread_loops.append(loop)
+    return loop.run_until_complete(coro)
+
+
+def close_thread_loops() -> None:
+    """
+    Close the event loops created by run_coroutine().
+
+    Must only be called once the threads that used them have finished.
+    """
+    with _thread_loops_lock:
+        loops = list(_thread_loops)
+        _thread_loops.clear()
+    for loop in loops:
+        if not loop.is_closed():
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+
+def scrape_webpage(
+    url: str,
+    session: requests.Session,
+    parse_executor: Optional[Executor] = None,
+    frontier: Optional[CrawlFrontier] = None,
+    depth: int = 0,
+    content_cache: Optional[ContentCache] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Scrape a webpage and extract Sanskrit verses.
+
+    Synchronous wrapper around scrape_webpage_async() using the requests
+    session as fetch backend. It runs on the calling thread's event loop, see
+    run_coroutine().
+
+    Args:
+        url (str): URL of the webpage to scrape.
+        session (requests.Session): Session object for making HTTP requests.
+        parse_executor (Optional[Executor], optional): Executor to parse in.
+            Defaults to None, which parses inline.
+        frontier (Optional[CrawlFrontier], optional): Frontier deciding which
+            frames are fetched. Defaults to None, which fetches all frames.
+        depth (int, optional): Link depth of the page in the crawl. Defaults to 0.
+        content_cache (Optional[ContentCache], optional): Cache of parsed frames
+            shared by the pages of a crawl. Defaults to None.
+
+    Returns:
+        Optional[Dict[str, Any]]: Dictionary with the URL and a list of extracted
+            Sanskrit verses, or None if scraping fails.
+            Format: {'url': str, 'sanskrit_verses': List[str]}
+
+    Raises:
+        No exceptions are raised; errors are logged and None is returned.
+    """
+    return run_coroutine(
+        scrape_webpage_async(
+            url, SessionFetcher(session), parse_executor, frontier, depth, content_cache
+        )
+    )
+
+
+def is_mojibake(text: str) -> bool:
+    """
+    Check whether text looks like UTF-8 that was decoded as Latin-1 or cp1252.
+
+    Args:
+        text (str): Text to check.
+
+    Returns:
+        bool: True if the text contains a UTF-8 byte sequence spelled out in
+            single-byte characters, such as "à¤" for the start of a Devanagari
+            character.
+    """
+    return MOJIBAKE_PATTERN.search(text) is not None
+
+
+def repair_mojibake(text: str) -> Optional[str]:
+    """
+    Undo the decoding of UTF-8 text as Latin-1 or cp1252.
+
+    Args:
+        text (str): Mis-decoded text.
+
+    Returns:
+        Optional[str]: The repaired text, or None if the text cannot be
+            re-encoded with any of MOJIBAKE_ENCODINGS into valid UTF-8, e.g.
+            because it was decoded correctly.
+    """
+    for encoding in MOJIBAKE_ENCODINGS:
+        try:
+            return text.encode(encoding).decode("utf-8")
+        except UnicodeError:
+            continue
+    return None
+
+
+def fix_verses(verses: List[str]) -> List[str]:
+    """
+    Repair the verses of one document (page or frame) in a single pass.
+
+    Mojibake is detected once for the whole document. If there is none the
+    verses are returned unchanged, so text that was decoded correctly is never
+    re-encoded. Otherwise all verses are joined with VERSE_SEPARATOR and
+    repaired with one encode/decode. Only when that fails, because the
+    document mixes correct and mis-decoded verses, is each verse repaired on
+    its own.
+
+    Args:
+        verses (List[str]): Verses of one document.
+
+    Returns:
+        List[str]: Repaired verses, in the same order.
+    """
+    document = VERSE_SEPARATOR.join(verses)
+    if not is_mojibake(document):
+        return verses
+
+    repaired = repair_mojibake(document)
+    if repaired is not None:
+        fixed = repaired.split(VERSE_SEPARATOR)
+        if len(fixed) == len(verses):
+            return fixed
+
+    logging.debug("Repairing verse encoding verse by verse")
+    fixed = []
+    for verse in verses:
+        repaired = repair_mojibake(verse) if is_mojibake(verse) else None
+        fixed.append(verse if repaired is None else repaired)
+    return fixed
+
+
+@timed_stage("fix_encoding")
+def fix_encoding(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fix encoding issues in Sanskrit verses.
+
+    Repairs verses whose UTF-8 text was decoded as Latin-1 or cp1252 during
+    scraping, which is common for Sanskrit pages served without a charset.
+    See fix_verses().
+
+    Args:
+        data (Dict[str, Any]): Dictionary containing scraped data with 'sanskrit_verses' key.
+
+    Returns:
+        Dict[str, Any]: Dictionary with fixed encoding for Sanskrit verses.
+
+    Note:
+        Verses without mojibake, or that cannot be repaired, are kept as they are.
+    """
+    if "sanskrit_verses" not in data:
+        logging.warning("No 'sanskrit_verses' key found in data")
+        return data
+
+    data["sanskrit_verses"] = fix_verses(data["sanskrit_verses"])
+    return data
+
+
+def verse_records(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Flatten scraped data into one record per verse.
+
+    Args:
+        data (Dict[str, Any]): Dictionary containing the scraped data.
+
+    Returns:
+        List[Dict[str, Any]]: Records with 'kanda', 'chapter_number',
+            'chapter_title', 'verse_number', 'content' and 'url' keys. The
+            kanda is taken from the data, or else from the sarga URL (see
+            parse_sarga_url()). The chapter keys are None for single pages.
+    """
+    kanda = data.get("kanda") or parse_sarga_url(data["url"])[0]
+    return [
+        {
+            "kanda": kanda,
+            "chapter_number": data.get("chapter_number"),
+            "chapter_title": data.get("chapter_title"),
+            "verse_number": i,
+            "content": verse,
+            "url": data["url"],
+        }
+        for i, verse in enumerate(data.get("sanskrit_verses", []), 1)
+    ]
+
+
+@timed_stage("save")
+def save_data(data: Dict[str, Any], output_file: str, output_format: str) -> None:
+    """
+    Save data in the specified format (JSON, CSV, TXT, JSONL, Parquet, or SQLite).
+
+    Args:
+        data (Dict[str, Any]): Dictionary containing the scraped data.
+        output_file (str): Path where the output file should be saved.
+        output_format (str): Format to save the data in ("json", "csv", "txt",
+            "jsonl", "parquet", or "sqlite").
+
+    Note:
+        - Creates any necessary directories in the output path.
+        - For CSV output, flattens the data structure.
+        - For TXT output, formats each verse with a number.
+        - JSONL, Parquet and SQLite output are written with the corpus sink
+          of the format (see CORPUS_SINKS), with one row per verse.
+        - Uses UTF-8 encoding for all output formats.
+    """
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+
+    if output_format == "json":
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+    elif output_format == "csv":
+        flattened_data = [
+            {"verse_number": i, "content": verse, "url": data["url"]}
+            for i, verse in enumerate(data.get("sanskrit_verses", []), 1)
+        ]
+
+        if flattened_data:
+            with open(output_file, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=flattened_data[0].keys())
+                writer.writeheader()
+                writer.writerows(flattened_data)
+        else:
+            logging.warning("No Sanskrit verses found to save to CSV")
+            return
+    elif output_format == "txt":
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(f"Sanskrit verses from: {data['url']}\n\n")
+            for i, verse in enumerate(data.get("sanskrit_verses", []), 1):
+                f.write(f"Verse {i}:\n{verse}\n\n")
+    elif output_format in CORPUS_SINKS:
+        sink = CORPUS_SINKS[output_format](output_file)
+        try:
+            sink.write_chapter(data)
+        finally:
+            sink.close()
+
+    logging.info(
+        f"Sanskrit verses saved as {
+            output_format.upper()} to {output_file}"
+    )
+
+
+def extract_chapter_links(soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
+    """
+    Extract chapter links from a contents page.
+
+    This function looks for a table structure containing chapter titles and links.
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML content to extract chapter links from.
+        base_url (str): Base URL for resolving relative URLs.
+
+    Returns:
+        List[Dict[str, str]]: List of dictionaries with chapter information.
+            Each dictionary contains:
+            - 'url': The chapter URL (absolute)
+            - 'title': The chapter title (cleaned for use in filenames)
+
+    Note:
+        The function cleans chapter titles by removing leading numbers,
+        special characters, and formatting the text for use in filenames.
+    """
+    chapter_links = []
+    rows = soup.find_all("tr")
+
+    for row in rows:
+        cells = row.find_all("td")
+        if len(cells) >= 2:
+            link_cell = cells[1]
+            anchor = link_cell.find("a", href=True)
+
+            if anchor and "href" in anchor.attrs:
+                href = anchor["href"]
+
+                # Get chapter title from first cell
+                title_cell = cells[0]
+                title_anchor = title_cell.find("a")
+                title = (
+                    title_anchor.get_text(strip=True)
+                    if title_anchor
+                    else title_cell.get_text(strip=True)
+                )
+
+                # Clean the title for filename
+                # Remove leading numbers
+                title = re.sub(r"^\d+\.?\s*", "", title)
+                # Remove special characters
+                title = re.sub(r"[^\w\s-]", "", title)
+                title = title.strip().replace(" ", "_")[:50]  # Format and limit length
+
+                # Handle relative URLs
+                if not href.startswith("http"):
+                    href = urljoin(base_url, href)
+
+                chapter_links.append({"url": href, "title": title})
+                logging.debug(f"Found chapter link: {title} -> {href}")
+
+    return chapter_links
+
+
+def kanda_name(url: str) -> str:
+    """
+    Get the name of a kanda from the URL of its contents page.
+
+    Args:
+        url (str): URL of a contents page, e.g. .../utf8/baala/bala_contents.htm.
+
+    Returns:
+        str: Name of the directory holding the kanda, e.g. "baala", or the
+            contents page name without "_contents" if it has no directory.
+    """
+    parts = urlparse(url).path.strip("/").split("/")
+    if len(parts) >= 2:
+        return parts[-2]
+    return KANDA_CONTENTS_PATTERN.sub("", parts[-1])
+
+
+def extract_kanda_links(soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
+    """
+    Extract links to kanda contents pages from a site index page.
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML content to extract kanda links from.
+        base_url (str): Base URL for resolving relative URLs.
+
+    Returns:
+        List[Dict[str, str]]: Kandas in page order, without duplicates. Each
+            dictionary contains:
+            - 'url': The contents page URL (absolute)
+            - 'kanda': The kanda name (see kanda_name())
+    """
+    kanda_links = []
+    seen = set()
+    for anchor in soup.find_all("a", href=True):
+        href = urljoin(base_url, anchor["href"])
+        key = normalize_url(href)
+        if not KANDA_CONTENTS_PATTERN.search(urlparse(href).path) or key in seen:
+            continue
+        seen.add(key)
+        kanda_links.append({"url": href, "kanda": kanda_name(href)})
+        logging.debug(f"Found kanda link: {kanda_links[-1]['kanda']} -> {href}")
+    return kanda_links
+
+
+def discover_kandas(
+    url: str, session: requests.Session, frontier: Optional[CrawlFrontier] = None
+) -> List[Dict[str, Any]]:
+    """
+    Find the contents pages of all kandas linked from a site index page.
+
+    Args:
+        url (str): URL of the site root or another page linking to the kandas.
+        session (requests.Session): Session object for making HTTP requests.
+        frontier (Optional[CrawlFrontier], optional): Frontier of the crawl, in
+            which the index page has depth 0. Frames it refuses are not
+            fetched. Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: Kanda dictionaries as returned by
+            extract_kanda_links(), plus the link 'depth' of the contents page.
+
+    Raises:
+        requests.RequestException: If the index page or one of its frames
+            cannot be fetched.
+
+    Note:
+        If the page itself links to no contents page, the frames of a
+        frameset index are searched instead. Frames disallowed by robots.txt
+        are skipped with a warning.
+    """
+    with stage_timer("fetch"):
+        response = session.get(url)
+    response.raise_for_status()
+    soup = response_soup(response)
+    kanda_links = extract_kanda_links(soup, url)
+    if kanda_links:
+        return [{**kanda, "depth": 1} for kanda in kanda_links]
+
+    seen = set()
+    for frame_url in get_frame_urls(soup, url):
+        if frontier is not None and not frontier.visit(frame_url, 1):
+            continue
+        if not check_robots_txt(frame_url, session.headers["User-Agent"], session):
+            logging.warning(f"Skipping frame {frame_url}: disallowed by robots.txt")
+            continue
+        with stage_timer("fetch"):
+            response = session.get(frame_url)
+        response.raise_for_status()
+        for kanda in extract_kanda_links(response_soup(response), frame_url):
+            key = normalize_url(kanda["url"])
+            if key not in seen:
+                seen.add(key)
+                kanda_links.append({**kanda, "depth": 2})
+    return kanda_links
+
+
+def fetch_chapter_links(url: str, session: requests.Session) -> List[Dict[str, str]]:
+    """
+    Fetch a contents page and extract its chapter links.
+
+    Args:
+        url (str): URL of the contents page.
+        session (requests.Session): Session object for making HTTP requests.
+
+    Returns:
+        List[Dict[str, str]]: Chapter links as returned by extract_chapter_links().
+
+    Raises:
+        requests.RequestException: If the contents page cannot be fetched.
+    """
+    with stage_timer("fetch"):
+        response = session.get(url)
+    response.raise_for_status()
+    return extract_chapter_links(response_soup(response), url)
+
+
+def fetch_kanda_chapters(
+    kanda: Dict[str, Any],
+    session: requests.Session,
+    frontier: Optional[CrawlFrontier] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch the chapter links of a kanda, tagged with the kanda they belong to.
+
+    Args:
+        kanda (Dict[str, Any]): Kanda dictionary with 'url', 'kanda' and
+            'depth' keys, see discover_kandas().
+        session (requests.Session): Session object for making HTTP requests.
+        frontier (Optional[CrawlFrontier], optional): Frontier of the crawl.
+            The contents page is not fetched if the frontier refuses it.
+            Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: Chapter dictionaries with 'url' and 'title' keys,
+            plus 'kanda', the 1-based 'number' of the chapter within the kanda
+            and the link 'depth' of the chapter page. Empty if the contents
+            page cannot be fetched or is disallowed by robots.txt.
+    """
+    depth = kanda.get("depth", 1)
+    if frontier is not None and not frontier.visit(kanda["url"], depth):
+        return []
+    if not check_robots_txt(kanda["url"], session.headers["User-Agent"], session):
+        logging.warning(f"Skipping kanda {kanda['kanda']}: disallowed by robots.txt")
+        return []
+
+    try:
+        chapter_links = fetch_chapter_links(kanda["url"], session)
+    except requests.RequestException as e:
+        logging.error(f"Error fetching contents of kanda {kanda['kanda']}: {e}")
+        return []
+
+    logging.info(f"Found {len(chapter_links)} chapters in kanda {kanda['kanda']}")
+    return [
+        {**chapter, "kanda": kanda["kanda"], "number": number, "depth": depth + 1}
+        for number, chapter in enumerate(chapter_links, 1)
+    ]
+
+
+class JsonlSink:
+    """
+    Thread-safe sink streaming the verses of a whole crawl into one JSONL file.
+
+    Each chapter's verses are appended as one JSON object per line (see
+    verse_records()) and flushed as soon as the chapter is saved, so other
+    processes can tail the file while the crawl runs and memory use does not
+    grow with the size of the crawl.
+
+    Attributes:
+        path (str): Path of the JSONL stream file.
+    """
+
+    filename = "verses.jsonl"
+
+    def __init__(self, path: str, append: bool = False):
+        """
+        Open the stream file.
+
+        Args:
+            path (str): Path of the stream file.
+            append (bool, optional): Append to an existing stream file, used when
+                resuming a crawl. Defaults to False.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+
+    def saved_urls(self) -> Set[str]:
+        """
+        Return the URLs of the chapters whose verses are in the stream file.
+
+        Returns:
+            Set[str]: Chapter URLs found in the file.
+        """
+        urls = set()
+        with self._lock:
+            self._file.flush()
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        urls.add(json.loads(line)["url"])
+                    except (ValueError, KeyError):
+                        # A crash can leave a truncated last line behind
+                        continue
+        return urls
+
+    def write_chapter(self, data: Dict[str, Any]) -> str:
+        """
+        Append the verses of a chapter and flush them to disk.
+
+        Args:
+            data (Dict[str, Any]): Scraped chapter data with chapter information.
+
+        Returns:
+            str: Path of the stream file.
+        """
+        lines = "".join(
+            json.dumps(record, ensure_ascii=False) + "\n"
+            for record in verse_records(data)
+        )
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+        return self.path
+
+    def close(self) -> None:
+        """Close the stream file."""
+        self._file.close()
+
+
+def parse_sarga_url(url: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Get the kanda name and sarga number from a sarga page URL.
+
+    Args:
+        url (str): URL of a sarga page, e.g. .../utf8/baala/sarga1/bala_1_frame.htm.
+
+    Returns:
+        Tuple[Optional[str], Optional[int]]: Kanda name and sarga number, or
+            (None, None) if the URL does not follow the sarga URL layout.
+    """
+    match = SARGA_URL_PATTERN.search(urlparse(url).path)
+    if not match:
+        return None, None
+    return match.group(1), int(match.group(2))
+
+
+class ParquetSink:
+    """
+    Thread-safe sink writing the verses of a whole crawl into one Parquet file.
+
+    Verses are buffered and written as a row group whenever
+    PARQUET_ROW_GROUP_SIZE rows have been collected, so memory use stays
+    bounded. The file is written under a temporary name and only moved into
+    place by close(), because a Parquet file is unreadable until its footer
+    has been written. Requires pyarrow.
+
+    If the crawl crashes, none of its verses reach the Parquet file, although
+    the crawl manifest already records the chapters as done. Resumed crawls
+    therefore compare the manifest with saved_urls() and scrape the chapters
+    missing from the file again.
+
+    Attributes:
+        path (str): Path of the Parquet file.
+    """
+
+    filename = "verses.parquet"
+
+    def __init__(self, path: str, append: bool = False):
+        """
+        Open the Parquet writer.
+
+        Args:
+            path (str): Path of the Parquet file.
+            append (bool, optional): Keep the rows of an existing file, used when
+                resuming a crawl. Defaults to False.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        if pyarrow is None:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+
+        self.path = path
+        self.schema = pyarrow.schema(
+            [
+                ("kanda", pyarrow.string()),
+                ("sarga", pyarrow.int32()),
+                ("chapter_title", pyarrow.string()),
+                ("verse_number", pyarrow.int32()),
+                ("text", pyarrow.string()),
+                ("transliteration", pyarrow.string()),
+                ("url", pyarrow.string()),
+            ]
+        )
+        self._lock = threading.Lock()
+        self._rows: List[Dict[str, Any]] = []
+        self._saved_urls: Set[str] = set()
+        self._temp_path = f"{path}.tmp"
+        self._writer = pyarrow.parquet.ParquetWriter(self._temp_path, self.schema)
+
+        if append and os.path.exists(path):
+            existing = pyarrow.parquet.ParquetFile(path)
+            for i in range(existing.num_row_groups):
+                row_group = existing.read_row_group(i)
+                self._writer.write_table(row_group)
+                self._saved_urls.update(row_group.column("url").to_pylist())
+            logging.info(f"Kept {existing.metadata.num_rows} rows from {path}")
+
+    def saved_urls(self) -> Set[str]:
+        """
+        Return the URLs of the chapters kept from the existing Parquet file.
+
+        Chapters written since the sink was opened are not included, because
+        they only reach the file when the sink is closed.
+
+        Returns:
+            Set[str]: Chapter URLs found in the file.
+        """
+        return set(self._saved_urls)
+
+    def write_chapter(self, data: Dict[str, Any]) -> str:
+        """
+        Add the verses of a chapter, writing a row group when the buffer is full.
+
+        Args:
+            data (Dict[str, Any]): Scraped chapter data with chapter information.
+
+        Returns:
+            str: Path of the Parquet file.
+        """
+        _, sarga = parse_sarga_url(data["url"])
+        transliterations = data.get("transliterations") or []
+        rows = [
+            {
+                "kanda": record["kanda"],
+                "sarga": sarga or record["chapter_number"],
+                "chapter_title": record["chapter_title"],
+                "verse_number": record["verse_number"],
+                "text": record["content"],
+                "transliteration": (
+                    transliterations[i] if i < len(transliterations) else None
+                ),
+                "url": record["url"],
+            }
+            for i, record in enumerate(verse_records(data))
+        ]
+
+        with self._lock:
+            self._rows.extend(rows)
+            if len(self._rows) >= PARQUET_ROW_GROUP_SIZE:
+                self._write_row_group()
+        return self.path
+
+    def _write_row_group(self) -> None:
+        """Write the buffered rows as one row group. Caller holds the lock."""
+        if self._rows:
+            table = pyarrow.Table.from_pylist(self._rows, schema=self.schema)
+            self._writer.write_table(table, row_group_size=len(self._rows))
+            self._rows = []
+
+    def close(self) -> None:
+        """Write the remaining rows and move the finished file into place."""
+        with self._lock:
+            self._write_row_group()
+            self._writer.close()
+            os.replace(self._temp_path, self.path)
+
+
+class SqliteSink:
+    """
+    Thread-safe sink upserting the chapters and verses of a crawl into SQLite.
+
+    Chapters are keyed by URL and verses by chapter and verse number, so
+    scraping a chapter again replaces its rows instead of duplicating them and
+    the database can be kept as a corpus across crawls. Each chapter is written
+    in a single transaction. Verse text is indexed in the FTS5 table
+    verses_fts, which triggers keep in sync with the verses table; see
+    search_corpus().
+
+    Attributes:
+        path (str): Path of the SQLite database.
+    """
+
+    filename = "verses.sqlite"
+    schema = """
+        CREATE TABLE IF NOT EXISTS chapters (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            kanda TEXT,
+            sarga INTEGER,
+            chapter_title TEXT,
+            verses_count INTEGER NOT NULL DEFAULT 0,
+            scraped_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS verses (
+            id INTEGER PRIMARY KEY,
+            chapter_id INTEGER NOT NULL REFERENCES chapters(id) ON DELETE CASCADE,
+            verse_number INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            transliteration TEXT,
+            UNIQUE (chapter_id, verse_number)
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS verses_fts USING fts5(
+            text, transliteration, content='verses', content_rowid='id'
+        );
+        CREATE TRIGGER IF NOT EXISTS verses_ai AFTER INSERT ON verses BEGIN
+            INSERT INTO verses_fts(rowid, text, transliteration)
+            VALUES (new.id, new.text, new.transliteration);
+        END;
+        CREATE TRIGGER IF NOT EXISTS verses_ad AFTER DELETE ON verses BEGIN
+            INSERT INTO verses_fts(verses_fts, rowid, text, transliteration)
+            VALUES ('delete', old.id, old.text, old.transliteration);
+        END;
+        CREATE TRIGGER IF NOT EXISTS verses_au AFTER UPDATE ON verses BEGIN
+            INSERT INTO verses_fts(verses_fts, rowid, text, transliteration)
+            VALUES ('delete', old.id, old.text, old.transliteration);
+            INSERT INTO verses_fts(rowid, text, transliteration)
+            VALUES (new.id, new.text, new.transliteration);
+        END;
+    """
+
+    def __init__(self, path: str, append: bool = False):
+        """
+        Open the database and create the schema if needed.
+
+        Args:
+            path (str): Path of the SQLite database.
+            append (bool, optional): Accepted for compatibility with the other
+                sinks. Existing rows are always kept, since chapters are
+                upserted. Defaults to False.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(self.schema)
+
+    def saved_urls(self) -> Set[str]:
+        """
+        Return the URLs of the chapters stored in the database.
+
+        Returns:
+            Set[str]: Chapter URLs found in the chapters table.
+        """
+        with self._lock:
+            return {url for (url,) in self._conn.execute("SELECT url FROM chapters")}
+
+    def write_chapter(self, data: Dict[str, Any]) -> str:
+        """
+        Upsert a chapter and its verses in one transaction.
+
+        Args:
+            data (Dict[str, Any]): Scraped chapter data with chapter information.
+
+        Returns:
+            str: Path of the SQLite database.
+        """
+        kanda, sarga = parse_sarga_url(data["url"])
+        kanda = data.get("kanda") or kanda
+        transliterations = data.get("transliterations") or []
+        records = verse_records(data)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO chapters
+                    (url, kanda, sarga, chapter_title, verses_count, scraped_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    kanda = excluded.kanda,
+                    sarga = excluded.sarga,
+                    chapter_title = excluded.chapter_title,
+                    verses_count = excluded.verses_count,
+                    scraped_at = excluded.scraped_at
+                """,
+                (
+                    data["url"],
+                    kanda,
+                    sarga or data.get("chapter_number"),
+                    data.get("chapter_title"),
+                    len(records),
+                    time.strftime("%Y-%m-%d %H:%M:%S"),
+                ),
+            )
+            (chapter_id,) = self._conn.execute(
+                "SELECT id FROM chapters WHERE url = ?", (data["url"],)
+            ).fetchone()
+            self._conn.executemany(
+                """
+                INSERT INTO verses (chapter_id, verse_number, text, transliteration)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(chapter_id, verse_number) DO UPDATE SET
+                    text = excluded.text,
+                    transliteration = excluded.transliteration
+                WHERE text IS NOT excluded.text
+                    OR transliteration IS NOT excluded.transliteration
+                """,
+                [
+                    (
+                        chapter_id,
+                        record["verse_number"],
+                        record["content"],
+                        transliterations[i] if i < len(transliterations) else None,
+                    )
+                    for i, record in enumerate(records)
+                ],
+            )
+            # Drop verses left over from an earlier, longer version of the chapter
+            self._conn.execute(
+                "DELETE FROM verses WHERE chapter_id = ? AND verse_number > ?",
+                (chapter_id, len(records)),
+            )
+        return self.path
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+def search_corpus(
+    path: str, query: str, limit: int = SEARCH_LIMIT
+) -> List[Dict[str, Any]]:
+    """
+    Search the verses of a SQLite corpus written with SqliteSink.
+
+    Args:
+        path (str): Path of the SQLite database.
+        query (str): FTS5 query, e.g. a word, "a phrase", a prefix* or
+            an expression such as 'rama AND sita'.
+        limit (int, optional): Maximum number of results. Defaults to SEARCH_LIMIT.
+
+    Returns:
+        List[Dict[str, Any]]: Matching verses, best match first, with 'kanda',
+            'sarga', 'chapter_title', 'verse_number', 'text', 'transliteration'
+            and 'url' keys.
+
+    Raises:
+        sqlite3.Error: If the database cannot be opened or the query is invalid.
+    """
+    # Open read-only so that a mistyped path is an error, not a new database
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(
+            """
+            SELECT c.kanda, c.sarga, c.chapter_title, v.verse_number, v.text,
+                v.transliteration, c.url
+            FROM verses_fts
+            JOIN verses v ON v.id = verses_fts.rowid
+            JOIN chapters c ON c.id = v.chapter_id
+            WHERE verses_fts MATCH ?
+            ORDER BY verses_fts.rank
+            LIMIT ?
+            """,
+            (query, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+# Output formats that collect all chapters of a crawl in a single store
+# instead of one file per chapter
+CORPUS_SINKS = {"jsonl": JsonlSink, "parquet": ParquetSink, "sqlite": SqliteSink}
+OUTPUT_FORMATS = ["json", "csv", "txt"] + list(CORPUS_SINKS)
+
+
+def file_sha256(path: str) -> str:
+    """
+    Compute the SHA-256 hex digest of a file.
+
+    Args:
+        path (str): Path of the file to hash.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CrawlManifest:
+    """
+    Append-only JSONL log of chapter outcomes, used to resume crawls.
+
+    Every processed chapter appends one line with its URL, kanda, status,
+    output file and the SHA-256 of that file. When a crawl is resumed, the last record of
+    each URL decides whether the chapter is skipped: only chapters marked done
+    whose output file still exists with the recorded hash are skipped, all
+    others are scraped again.
+
+    Chapters saved to a corpus sink share one output file, so their file is
+    not hashed and only its existence is checked.
+
+    Attributes:
+        path (str): Path of the manifest file.
+        hash_files (bool): Whether output files are hashed and verified.
+    """
+
+    def __init__(self, path: str, resume: bool = False, hash_files: bool = True):
+        """
+        Open the manifest.
+
+        Args:
+            path (str): Path of the manifest file.
+            resume (bool, optional): Load existing records and append to them.
+                If False, the manifest is started from scratch. Defaults to False.
+            hash_files (bool, optional): Hash output files and verify the hash
+                on resume. Defaults to True.
+        """
+        self.path = path
+        self.hash_files = hash_files
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self._records[record["url"]] = record
+                    except (ValueError, KeyError):
+                        # A crash can leave a truncated last line behind
+                        logging.debug(f"Skipping malformed manifest line: {line!r}")
+            logging.info(f"Loaded {len(self._records)} records from {path}")
+
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def completed_entry(
+        self, chapter: Dict[str, str], output_format: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the summary entry of a chapter that was already saved.
+
+        Args:
+            chapter (Dict[str, str]): Chapter dictionary with 'url' and 'title' keys.
+            output_format (str): Format of the current crawl; files saved in a
+                different format do not count as done.
+
+        Returns:
+            Optional[Dict[str, Any]]: Summary entry, or None if the chapter must
+                be scraped (again).
+        """
+        record = self._records.get(chapter["url"])
+        if not record or record.get("status") != "done":
+            return None
+
+        output_file = record.get("file", "")
+        if not output_file.endswith(f".{output_format}") or not os.path.exists(
+            output_file
+        ):
+            return None
+        if self.hash_files and file_sha256(output_file) != record.get("sha256"):
+            logging.warning(f"{output_file} changed since it was saved, re-scraping")
+            return None
+
+        entry = {
+            "title": record["title"],
+            "url": record["url"],
+            "file": output_file,
+            "verses_count": record["verses_count"],
+        }
+        # Manifests written before kandas were recorded fall back to the chapter
+        kanda = record.get("kanda", chapter.get("kanda"))
+        if kanda is not None:
+            entry["kanda"] = kanda
+        return entry
+
+    def record(
+        self,
+        chapter_number: int,
+        chapter: Dict[str, str],
+        entry: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Append the outcome of a chapter and flush it to disk.
+
+        Args:
+            chapter_number (int): 1-based position of the chapter in the contents page.
+            chapter (Dict[str, str]): Chapter dictionary with 'url' and 'title' keys.
+            entry (Optional[Dict[str, Any]]): Summary entry of the saved chapter,
+                or None if the chapter failed.
+        """
+        record = {
+            "url": chapter["url"],
+            "title": chapter["title"],
+            "chapter_number": chapter_number,
+            "status": "done" if entry else "failed",
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        if "kanda" in chapter:
+            record["kanda"] = chapter["kanda"]
+        if entry:
+            record.update(
+                {
+                    "file": entry["file"],
+                    "sha256": file_sha256(entry["file"]) if self.hash_files else None,
+                    "verses_count": entry["verses_count"],
+                }
+            )
+
+        with self._lock:
+            self._records[chapter["url"]] = record
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def rehash(self, files: Set[str], directory: str) -> int:
+        """
+        Record the new hash of output files that were changed after the crawl.
+
+        Without this, a resumed crawl would scrape the chapters of files
+        repaired by fix_directory() again.
+
+        Args:
+            files (Set[str]): Real paths (os.path.realpath()) of the changed files.
+            directory (str): Output directory of the crawl, used to resolve the
+                recorded paths, see resolve_recorded_file().
+
+        Returns:
+            int: Number of chapters whose record was updated.
+        """
+        hashed = updated = 0
+        for record in list(self._records.values()):
+            if record.get("status") != "done" or not record.get("sha256"):
+                continue
+            hashed += 1
+            path = resolve_recorded_file(record.get("file", ""), directory)
+            if path not in files:
+                continue
+            record = {
+                **record,
+                "sha256": file_sha256(path),
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            with self._lock:
+                self._records[record["url"]] = record
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._file.flush()
+            updated += 1
+        if hashed and not updated:
+            logging.warning(f"No chapter in {self.path} matches a changed file")
+        return updated
+
+    def close(self) -> None:
+        """Close the manifest file."""
+        self._file.close()
+
+
+class VerseIndex:
+    """
+    Thread-safe index of verse fingerprints, used to find repeated shlokas.
+
+    Verses are compared after collapsing whitespace and removing the trailing
+    verse reference (see VERSE_REFERENCE_PATTERN), so a shloka repeated in
+    another sarga matches although its numbering differs. Only a 16-byte
+    digest is kept per verse. Chapters may be added in any order, and
+    duplicates() reports repeats in chapter order, so the result does not
+    depend on which worker finishes first.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._lock = threading.Lock()
+        self._chapters: Dict[int, Tuple[str, List[Optional[bytes]]]] = {}
+
+    @staticmethod
+    def fingerprint(verse: str) -> Optional[bytes]:
+        """
+        Compute the fingerprint of a verse.
+
+        Args:
+            verse (str): Verse text.
+
+        Returns:
+            Optional[bytes]: Digest of the normalized verse, or None if nothing
+                but the verse reference is left.
+        """
+        text = VERSE_REFERENCE_PATTERN.sub("", " ".join(verse.split()))
+        if not text:
+            return None
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def add(self, chapter_number: int, data: Dict[str, Any]) -> None:
+        """
+        Index the verses of a chapter.
+
+        Args:
+            chapter_number (int): Position of the chapter in the crawl.
+            data (Dict[str, Any]): Scraped chapter data.
+        """
+        fingerprints = [
+            self.fingerprint(verse) for verse in data.get("sanskrit_verses", [])
+        ]
+        with self._lock:
+            self._chapters[chapter_number] = (data["url"], fingerprints)
+
+    def duplicates(self) -> List[Dict[str, Any]]:
+        """
+        Find verses that repeat a verse seen earlier in the crawl.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per repeated verse with its
+                'url' and 'verse_number', and 'duplicate_of', the 'url' and
+                'verse_number' of its first occurrence.
+        """
+        first: Dict[bytes, Dict[str, Any]] = {}
+        duplicates = []
+        with self._lock:
+            chapters = sorted(self._chapters.items())
+        for _, (url, fingerprints) in chapters:
+            for verse_number, fingerprint in enumerate(fingerprints, 1):
+                if fingerprint is None:
+                    continue
+                location = {"url": url, "verse_number": verse_number}
+                if fingerprint in first:
+                    duplicates.append({**location, "duplicate_of": first[fingerprint]})
+                else:
+                    first[fingerprint] = location
+        return duplicates
+
+
+def _save_chapter(
+    chapter_number: int,
+    chapter: Dict[str, str],
+    data: Optional[Dict[str, Any]],
+    output_format: str,
+    fix_encoding_flag: bool,
+    output_dir: str,
+    sink=None,
+    verse_index: Optional[VerseIndex] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Post-process and save the scraped data of a single chapter.
+
+    Args:
+        chapter_number (int): 1-based position of the chapter in the contents page.
+        chapter (Dict[str, str]): Chapter dictionary with 'url' and 'title' keys.
+            Chapters of a multi-kanda crawl also have 'kanda' and 'number' keys
+            (see fetch_kanda_chapters()), which override chapter_number and
+            place the output file in a subdirectory per kanda.
+        data (Optional[Dict[str, Any]]): Result of scraping the chapter page.
+        output_format (str): Format to save the data in ("json", "csv", or "txt").
+        fix_encoding_flag (bool): Whether to attempt to fix encoding issues.
+        output_dir (str): Directory to save the output file to.
+        sink (optional): Corpus sink to write the chapter to instead of its own
+            file, see CORPUS_SINKS. Defaults to None.
+        verse_index (Optional[VerseIndex], optional): Index the chapter's
+            verses are added to, to detect repeated verses. Defaults to None.
+
+    Returns:
+        Optional[Dict[str, Any]]: Summary entry for the chapter, or None if the
+            chapter has no verses.
+
+    Note:
+        The chapter number, and therefore the output filename, depends only on
+        the position of the chapter in the contents page, never on the order in
+        which concurrent workers finish.
+    """
+    if not data or not data.get("sanskrit_verses"):
+        logging.warning(
+            f"No Sanskrit verses found in chapter {
+                chapter['title']}"
+        )
+        return None
+
+    # Fix encoding if requested
+    if fix_encoding_flag:
+        data = fix_encoding(data)
+
+    if verse_index is not None:
+        verse_index.add(chapter_number, data)
+
+    # Add chapter information
+    chapter_number = chapter.get("number", chapter_number)
+    data["chapter_title"] = chapter["title"]
+    data["chapter_number"] = chapter_number
+    if "kanda" in chapter:
+        data["kanda"] = chapter["kanda"]
+
+    if sink is not None:
+        with stage_timer("save"):
+            output_file = sink.write_chapter(data)
+    else:
+        # Create filename and save
+        filename_base = f"{chapter_number:02d}_{chapter['title']}"
+        output_file = os.path.join(
+            output_dir, chapter.get("kanda", ""), f"{filename_base}.{output_format}"
+        )
+
+        save_data(data, output_file, output_format)
+
+    entry = {
+        "title": chapter["title"],
+        "url": chapter["url"],
+        "file": output_file,
+        "verses_count": len(data.get("sanskrit_verses", [])),
+    }
+    if "kanda" in chapter:
+        entry["kanda"] = chapter["kanda"]
+    return entry
+
+
+def _robots_allows(chapter: Dict[str, str], session: requests.Session) -> bool:
+    """
+    Check robots.txt for a chapter URL, logging an error if it is disallowed.
+
+    Args:
+        chapter (Dict[str, str]): Chapter dictionary with 'url' and 'title' keys.
+        session (requests.Session): Session whose robots.txt cache is used.
+
+    Returns:
+        bool: True if scraping the chapter is allowed.
+    """
+    if check_robots_txt(chapter["url"], session.headers["User-Agent"], session):
+        return True
+
+    logging.error(
+        f"Scraping not allowed for {
+            chapter['url']} according to robots.txt"
+    )
+    return False
+
+
+def _process_chapter(
+    chapter_number: int,
+    chapter: Dict[str, str],
+    total: int,
+    session: requests.Session,
+    output_format: str,
+    fix_encoding_flag: bool,
+    output_dir: str,
+    parse_executor: Optional[Executor] = None,
+    sink=None,
+    frontier: Optional[CrawlFrontier] = None,
+    content_cache: Optional[ContentCache] = None,
+    verse_index: Optional[VerseIndex] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Scrape a single chapter with the requests session and save it to a file.
+
+    Args:
+        chapter_number (int): 1-based position of the chapter in the contents page.
+        chapter (Dict[str, str]): Chapter dictionary with 'url' and 'title' keys.
+        total (int): Total number of chapters, used for progress logging.
+        session (requests.Session): Session object for making HTTP requests.
+        output_format (str): Format to save the data in ("json", "csv", or "txt").
+        fix_encoding_flag (bool): Whether to attempt to fix encoding issues.
+        output_dir (str): Directory to save the output file to.
+        parse_executor (Optional[Executor], optional): Executor to parse in.
+            Defaults to None, which parses inline.
+        sink (optional): Corpus sink to write the chapter to. Defaults to None.
+        frontier (Optional[CrawlFrontier], optional): Frontier of the crawl,
+            used to skip frames fetched before. Defaults to None.
+        content_cache (Optional[ContentCache], optional): Cache of parsed frames
+            shared by the chapters. Defaults to None.
+        verse_index (Optional[VerseIndex], optional): Index of the verses of
+            the crawl. Defaults to None.
+
+    Returns:
+        Optional[Dict[str, Any]]: Summary entry for the chapter, or None if the
+            chapter could not be scraped.
+    """
+    logging.info(f"Processing chapter {chapter_number}/{total}: {chapter['title']}")
+
+    try:
+        if not _robots_allows(chapter, session):
+            return None
+
+        data = scrape_webpage(
+            chapter["url"],
+            session,
+            parse_executor,
+            frontier,
+            chapter.get("depth", CHAPTER_DEPTH),
+            content_cache,
+        )
+        return _save_chapter(
+            chapter_number,
+            chapter,
+            data,
+            output_format,
+            fix_encoding_flag,
+            output_dir,
+            sink,
+            verse_index,
+        )
+
+    except Exception as e:
+        logging.error(f"Error processing chapter {chapter['title']}: {e}")
+        return None
+
+
+async def _process_chapters_async(
+    next_chapter: Callable[[], Optional[Tuple[int, Dict[str, str]]]],
+    total: int,
+    session: requests.Session,
+    fetcher,
+    manifest: CrawlManifest,
+    output_format: str,
+    fix_encoding_flag: bool,
+    output_dir: str,
+    workers: int,
+    parse_executor: Optional[Executor] = None,
+    sink=None,
+    frontier: Optional[CrawlFrontier] = None,
+    content_cache: Optional[ContentCache] = None,
+    verse_index: Optional[VerseIndex] = None,
+    stop: Optional[threading.Event] = None,
+) -> Dict[int, Optional[Dict[str, Any]]]:
+    """
+    Scrape and save chapters concurrently on the event loop.
+
+    Runs `workers` tasks that each take the next chapter to scrape until there
+    is none left. On Ctrl-C, `stop` is set so that next_chapter() returns no
+    more chapters, and the chapters in progress are finished; a second Ctrl-C
+    aborts them.
+
+    Args:
+        next_chapter (Callable[[], Optional[Tuple[int, Dict[str, str]]]]):
+            Returns the next chapter to scrape with its chapter number, or None
+            when the crawl is done.
+        total (int): Total number of chapters, used for progress logging.
+        session (requests.Session): Session used for robots.txt checks.
+        fetcher: Async fetch backend, see create_fetcher().
+        manifest (CrawlManifest): Manifest recording each chapter's outcome.
+        output_format (str): Format to save the data in ("json", "csv", or "txt").
+        fix_encoding_flag (bool): Whether to attempt to fix encoding issues.
+        output_dir (str): Directory to save output files to.
+        workers (int): Number of chapters in flight at once.
+        parse_executor (Optional[Executor], optional): Executor to parse in.
+            Defaults to None, which parses on the event loop.
+        sink (optional): Corpus sink to write chapters to. Defaults to None.
+        frontier (Optional[CrawlFrontier], optional): Frontier of the crawl,
+            used to skip frames fetched before. Defaults to None.
+        content_cache (Optional[ContentCache], optional): Cache of parsed frames
+            shared by the chapters. Defaults to None.
+        verse_index (Optional[VerseIndex], optional): Index of the verses of
+            the crawl. Defaults to None.
+        stop (Optional[threading.Event], optional): Stop flag checked by
+            next_chapter(), set on Ctrl-C. Defaults to None, which leaves
+            Ctrl-C to asyncio.
+
+    Returns:
+        Dict[int, Optional[Dict[str, Any]]]: Summary entry (or None on failure)
+            by chapter number.
+    """
+    entries: Dict[int, Optional[Dict[str, Any]]] = {}
+    loop = asyncio.get_running_loop()
+
+    def interrupt() -> None:
+        logging.warning(INTERRUPT_MESSAGE)
+        stop.set()
+        # A second Ctrl-C raises KeyboardInterrupt again
+        loop.remove_signal_handler(signal.SIGINT)
 
-                # Get chapter title from first cell
-                title_cell = cells[0]
-                title_anchor = title_cell.find("a")
-                title = (
-                    title_anchor.get_text(strip=True)
-                    if title_anchor
-                    else title_cell.get_text(strip=True)
+    if stop is not None:
+        try:
+            loop.add_signal_handler(signal.SIGINT, interrupt)
+        except (NotImplementedError, RuntimeError):
+            # Not supported on Windows or outside the main thread
+            pass
+
+    async def process(
+        chapter_number: int, chapter: Dict[str, str]
+    ) -> Optional[Dict[str, Any]]:
+        logging.info(f"Processing chapter {chapter_number}/{total}: {chapter['title']}")
+        entry = None
+        try:
+            # robots.txt is cached, so this only blocks once per host
+            if await asyncio.to_thread(_robots_allows, chapter, session):
+                data = await scrape_webpage_async(
+                    chapter["url"],
+                    fetcher,
+                    parse_executor,
+                    frontier,
+                    chapter.get("depth", CHAPTER_DEPTH),
+                    content_cache,
+                )
+                entry = _save_chapter(
+                    chapter_number,
+                    chapter,
+                    data,
+                    output_format,
+                    fix_encoding_flag,
+                    output_dir,
+                    sink,
+                    verse_index,
                 )
+        except Exception as e:
+            logging.error(f"Error processing chapter {chapter['title']}: {e}")
 
-                # Clean the title for filename
-                # Remove leading numbers
-                title = re.sub(r"^\d+\.?\s*", "", title)
-                # Remove special characters
-                title = re.sub(r"[^\w\s-]", "", title)
-                title = title.strip().replace(" ", "_")[:50]  # Format and limit length
+        manifest.record(chapter_number, chapter, entry)
+        return entry
 
-                # Handle relative URLs
-                if not href.startswith("http"):
-                    href = urljoin(base_url, href)
+    async def worker() -> None:
+        while (queued := next_chapter()) is not None:
+            chapter_number, chapter = queued
+            entries[chapter_number] = await process(chapter_number, chapter)
 
-                chapter_links.append({"url": href, "title": title})
-                logging.debug(f"Found chapter link: {title} -> {href}")
+    try:
+        await asyncio.gather(*(worker() for _ in range(workers)))
+    finally:
+        if stop is not None and not stop.is_set():
+            try:
+                loop.remove_signal_handler(signal.SIGINT)
+            except (NotImplementedError, RuntimeError):
+                pass
+        await fetcher.close()
 
-    return chapter_links
+    return entries
 
 
 def process_chapter_links(
@@ -432,6 +3867,11 @@ def process_chapter_links(
     output_format: str,
     fix_encoding_flag: bool,
     output_dir: str = "ramayana_chapters",
+    workers: int = DEFAULT_WORKERS,
+    backend: str = "requests",
+    resume: bool = False,
+    parse_workers: int = 0,
+    frontier: Optional[CrawlFrontier] = None,
 ) -> Dict[str, Any]:
     """
     Process a list of chapter links, scrape content, and save to files.
@@ -439,91 +3879,229 @@ def process_chapter_links(
     Args:
         chapter_links (List[Dict[str, str]]): List of chapter dictionaries with 'url' and 'title' keys.
         session (requests.Session): Session object for making HTTP requests.
-        output_format (str): Format to save the data in ("json", "csv", or "txt").
+        output_format (str): Format to save the data in ("json", "csv", "txt",
+            "jsonl", "parquet", or "sqlite"). Formats in CORPUS_SINKS write all chapters to a single
+            store in the output directory instead of one file per chapter.
         fix_encoding_flag (bool): Whether to attempt to fix encoding issues.
         output_dir (str, optional): Directory to save output files to. Defaults to "ramayana_chapters".
+        workers (int, optional): Number of chapters fetched concurrently.
+            Each worker pops its next chapter from the frontier. Defaults to
+            DEFAULT_WORKERS.
+        backend (str, optional): Fetch backend. "requests" fetches chapters on a
+            thread pool; any other backend registered in FETCH_BACKENDS runs
+            all fetches on one asyncio event loop. Defaults to "requests".
+        resume (bool, optional): Skip chapters that the crawl manifest in
+            output_dir records as successfully saved. Defaults to False.
+        parse_workers (int, optional): Number of processes that parse fetched
+            pages while the fetch workers keep downloading. 0 parses in the
+            fetch workers. Defaults to 0.
+        frontier (Optional[CrawlFrontier], optional): Frontier of the crawl,
+            holding the URLs already fetched while discovering the chapters.
+            The chapters are queued in it in contents-page order and the fetch
+            workers pop their next chapter from it until its queue is empty.
+            Chapters may carry a 'depth' key (default CHAPTER_DEPTH).
+            Defaults to None, which uses a new frontier.
 
     Returns:
         Dict[str, Any]: Results dictionary containing:
+            - 'interrupted': Whether the crawl was stopped with Ctrl-C
             - 'successful': Number of successfully processed chapters
             - 'failed': Number of failed chapters
             - 'chapters': List of successfully processed chapter information
+            - 'duplicate_verses': Verses repeating an earlier verse of the
+              crawl, see VerseIndex.duplicates()
+            - 'stage_timings': Time spent in each stage (robots, fetch, parse,
+              extract, fix_encoding, save) so far in this process, see
+              StageMetrics.summary()
 
     Note:
         - Creates the output directory if it doesn't exist.
-        - Implements polite scraping with delays between requests.
-        - Saves a summary of results as JSON in the output directory.
+        - Polite scraping is enforced by the session's per-host rate limiter,
+          which is shared by all workers.
+        - Saves a summary of results as JSON in the output directory. Chapters
+          are listed in contents-page order regardless of completion order.
+        - Records every chapter in a crawl manifest (MANIFEST_FILENAME) in the
+          output directory as soon as it completes.
+        - Every URL, including frames shared by several chapters, is fetched
+          at most once; duplicate chapter links are skipped. Frames are
+          cached by URL and body hash (ContentCache), so shared frames still
+          contribute their verses to every chapter and identical frame bodies
+          are parsed once.
+        - Repeated verses are detected across the chapters scraped in this
+          run (chapters skipped by resume are not compared).
+
+    Raises:
+        KeyboardInterrupt: On Ctrl-C, once the chapters in progress are
+            finished and the manifest, corpus sink and summary are written.
     """
     os.makedirs(output_dir, exist_ok=True)
     logging.info(f"Saving chapters to directory: {output_dir}")
 
-    results = {"successful": 0, "failed": 0, "chapters": []}
+    entries: Dict[int, Optional[Dict[str, Any]]] = {}
+    content_cache = ContentCache()
+    verse_index = VerseIndex()
 
-    for i, chapter in enumerate(chapter_links, 1):
-        logging.info(f"Processing chapter {i}/{len(chapter_links)}: {chapter['title']}")
-
-        try:
-            # Add delay with jitter to be respectful to the server
-            time.sleep(1 + random.random())
-
-            # Check if scraping is allowed
-            if not check_robots_txt(chapter["url"], session.headers["User-Agent"]):
-                logging.error(
-                    f"Scraping not allowed for {
-                        chapter['url']} according to robots.txt"
-                )
-                results["failed"] += 1
-                continue
+    sink = None
+    if output_format in CORPUS_SINKS:
+        sink_class = CORPUS_SINKS[output_format]
+        sink = sink_class(os.path.join(output_dir, sink_class.filename), resume)
+        logging.info(f"Streaming verses to {sink.path}")
 
-            # Scrape the webpage
-            data = scrape_webpage(chapter["url"], session)
+    manifest = CrawlManifest(
+        os.path.join(output_dir, MANIFEST_FILENAME), resume, hash_files=sink is None
+    )
+    # Chapters recorded as done whose verses never reached the corpus, e.g.
+    # because a crash lost the unfinished Parquet file, are scraped again
+    saved_urls = sink.saved_urls() if resume and sink is not None else None
+
+    # Queue the chapters in contents-page order; the frontier drops duplicate
+    # URLs and chapters deeper than its max_depth. Chapters already saved are
+    # only marked as seen.
+    if frontier is None:
+        frontier = CrawlFrontier()
+    total = 0
+    for i, chapter in enumerate(chapter_links):
+        depth = chapter.get("depth", CHAPTER_DEPTH)
+        entry = manifest.completed_entry(chapter, output_format) if resume else None
+        if entry and saved_urls is not None and chapter["url"] not in saved_urls:
+            logging.info(f"{chapter['url']} is missing from {sink.path}, re-scraping")
+            entry = None
+        if entry:
+            queued = frontier.visit(chapter["url"], depth)
+        else:
+            queued = frontier.add(
+                chapter["url"], depth, priority=i, info=(total + 1, chapter)
+            )
+        if not queued:
+            logging.info(
+                f"Skipping chapter {chapter['title']}: {chapter['url']} was "
+                "already queued or is too deep"
+            )
+            continue
+        total += 1
+        if entry:
+            entries[total] = entry
+    if resume:
+        logging.info(
+            f"Resuming crawl: {len(entries)} chapters already done, "
+            f"{total - len(entries)} to scrape"
+        )
 
-            if not data or not data.get("sanskrit_verses"):
-                logging.warning(
-                    f"No Sanskrit verses found in chapter {
-                        chapter['title']}"
+    stop = threading.Event()
+
+    def next_chapter() -> Optional[Tuple[int, Dict[str, str]]]:
+        # Fetch workers take their next chapter from the frontier, until the
+        # crawl is interrupted
+        if stop.is_set():
+            return None
+        queued = frontier.pop()
+        return None if queued is None else queued.info
+
+    workers = max(1, workers)
+    logging.info(f"Using {workers} worker(s) with the {backend} backend")
+    parse_executor = None
+    if parse_workers > 0:
+        logging.info(f"Parsing in {parse_workers} process(es)")
+        parse_executor = create_parse_executor(parse_workers)
+    try:
+        if backend == "requests":
+
+            def worker() -> None:
+                while (queued := next_chapter()) is not None:
+                    i, chapter = queued
+                    entries[i] = _process_chapter(
+                        i,
+                        chapter,
+                        total,
+                        session,
+                        output_format,
+                        fix_encoding_flag,
+                        output_dir,
+                        parse_executor,
+                        sink,
+                        frontier,
+                        content_cache,
+                        verse_index,
+                    )
+                    manifest.record(i, chapter, entries[i])
+
+            executor = ThreadPoolExecutor(max_workers=workers)
+            try:
+                for future in [executor.submit(worker) for _ in range(workers)]:
+                    future.result()
+            except KeyboardInterrupt:
+                logging.warning(INTERRUPT_MESSAGE)
+                stop.set()
+            finally:
+                # Waits for the chapters in progress only; a second Ctrl-C
+                # stops waiting
+                executor.shutdown(cancel_futures=True)
+        else:
+            fetcher = create_fetcher(
+                backend, session, limit=connection_pool_size(workers)
+            )
+            entries.update(
+                asyncio.run(
+                    _process_chapters_async(
+                        next_chapter,
+                        total,
+                        session,
+                        fetcher,
+                        manifest,
+                        output_format,
+                        fix_encoding_flag,
+                        output_dir,
+                        workers,
+                        parse_executor,
+                        sink,
+                        frontier,
+                        content_cache,
+                        verse_index,
+                        stop,
+                    )
                 )
-                results["failed"] += 1
-                continue
-
-            # Fix encoding if requested
-            if fix_encoding_flag:
-                data = fix_encoding(data)
-
-            # Add chapter information
-            data["chapter_title"] = chapter["title"]
-            data["chapter_number"] = i
-
-            # Create filename and save
-            filename_base = f"{i:02d}_{chapter['title']}"
-            output_file = os.path.join(output_dir, f"{filename_base}.{output_format}")
-
-            save_data(data, output_file, output_format)
-
-            results["successful"] += 1
-            results["chapters"].append(
-                {
-                    "title": chapter["title"],
-                    "url": chapter["url"],
-                    "file": output_file,
-                    "verses_count": len(data.get("sanskrit_verses", [])),
-                }
             )
-
-        except Exception as e:
-            logging.error(f"Error processing chapter {chapter['title']}: {e}")
-            results["failed"] += 1
+    finally:
+        manifest.close()
+        if sink is not None:
+            sink.close()
+        if parse_executor is not None:
+            parse_executor.shutdown()
+        close_thread_loops()
+
+    chapters = [entries[i] for i in sorted(entries) if entries[i] is not None]
+    results = {
+        "interrupted": stop.is_set(),
+        "successful": len(chapters),
+        "failed": total - len(chapters),
+        "chapters": chapters,
+        "duplicate_verses": verse_index.duplicates(),
+        "stage_timings": get_stage_metrics().summary(),
+    }
+    logging.info(
+        f"Frames served from the content cache: {content_cache.hits}, "
+        f"parses saved: {content_cache.parses_saved}"
+    )
+    if results["duplicate_verses"]:
+        logging.info(
+            f"Found {len(results['duplicate_verses'])} verses repeating an "
+            "earlier verse"
+        )
+    get_stage_metrics().log_summary()
 
     # Save scraping summary
-    summary_file = os.path.join(output_dir, "scraping_summary.json")
+    summary_file = os.path.join(output_dir, SUMMARY_FILENAME)
     with open(summary_file, "w", encoding="utf-8") as f:
         json.dump(
             {
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "total_chapters": len(chapter_links),
+                "total_chapters": total,
+                "interrupted": results["interrupted"],
                 "successful": results["successful"],
                 "failed": results["failed"],
                 "chapters": results["chapters"],
+                "duplicate_verses": results["duplicate_verses"],
+                "stage_timings": results["stage_timings"],
             },
             f,
             ensure_ascii=False,
@@ -535,40 +4113,375 @@ def process_chapter_links(
             results['successful']} successful, {
             results['failed']} failed"
     )
+    if results["interrupted"]:
+        # Chapters that were never started count as failed, so --resume
+        # scrapes them
+        raise KeyboardInterrupt
     return results
 
 
-def fix_file(filename: str, output: Optional[str] = None) -> None:
+@contextmanager
+def atomic_write(path: str):
+    """
+    Open a text file that replaces path only once it is completely written.
+
+    The data goes to a temporary file next to path, which is renamed over
+    path on success and removed on error, so readers never see a partial
+    file and path may also be the file being read.
+
+    Args:
+        path (str): Destination file.
+
+    Yields:
+        TextIO: The temporary file, opened for writing as UTF-8.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _is_verse_list_item(prefix: str) -> bool:
+    """Check whether an ijson prefix points at an item of a 'sanskrit_verses' list."""
+    return prefix == "sanskrit_verses.item" or prefix.endswith(".sanskrit_verses.item")
+
+
+def _is_verse_content(prefix: str) -> bool:
+    """Check whether an ijson prefix points at the 'content' of a verse record."""
+    return prefix == "content" or prefix.endswith(".content")
+
+
+def write_fixed_json_events(events, f) -> None:
+    """
+    Write a stream of ijson parse events as JSON, repairing verse encoding.
+
+    The output is formatted like save_data() (indent=4, non-ASCII kept).
+    Consecutive items of a 'sanskrit_verses' list are buffered and repaired
+    together with fix_verses(), and the 'content' of verse records (see
+    verse_records()) is repaired on its own. Memory use is bounded by the
+    largest verse list, not by the size of the document.
+
+    Args:
+        events: (prefix, event, value) tuples from ijson.parse().
+        f: Text file to write to.
+    """
+    # [closing bracket, number of items written] for each open container
+    stack: List[List[Any]] = []
+    verses: List[str] = []
+
+    def write_value(text: str) -> None:
+        if stack and stack[-1][0] == "]":
+            separator = "," if stack[-1][1] else ""
+            f.write(f"{separator}\n{JSON_INDENT * len(stack)}")
+            stack[-1][1] += 1
+        f.write(text)
+
+    def flush_verses() -> None:
+        for verse in fix_verses(verses):
+            write_value(json.dumps(verse, ensure_ascii=False))
+        verses.clear()
+
+    for prefix, event, value in events:
+        if event == "string" and _is_verse_list_item(prefix):
+            verses.append(value)
+            continue
+        if verses:
+            flush_verses()
+
+        if event == "map_key":
+            separator = "," if stack[-1][1] else ""
+            key = json.dumps(value, ensure_ascii=False)
+            f.write(f"{separator}\n{JSON_INDENT * len(stack)}{key}: ")
+            stack[-1][1] += 1
+        elif event in ("start_map", "start_array"):
+            write_value("{" if event == "start_map" else "[")
+            stack.append(["}" if event == "start_map" else "]", 0])
+        elif event in ("end_map", "end_array"):
+            closing, count = stack.pop()
+            if count:
+                f.write(f"\n{JSON_INDENT * len(stack)}")
+            f.write(closing)
+        elif event == "string":
+            if _is_verse_content(prefix):
+                value = fix_verses([value])[0]
+            write_value(json.dumps(value, ensure_ascii=False))
+        elif event == "number":
+            # ijson yields int or Decimal, whose str() is valid JSON
+            write_value(json.dumps(value) if isinstance(value, float) else str(value))
+        elif event == "boolean":
+            write_value("true" if value else "false")
+        elif event == "null":
+            write_value("null")
+
+
+def fix_jsonl_line(line: str) -> str:
+    """
+    Repair the verse encoding of one JSONL line.
+
+    Args:
+        line (str): A chapter object with 'sanskrit_verses', or a verse
+            record with 'content' (see verse_records()).
+
+    Returns:
+        str: The repaired line, without a line break.
+    """
+    record = json.loads(line)
+    if isinstance(record, dict):
+        if "sanskrit_verses" in record:
+            record = fix_encoding(record)
+        elif isinstance(record.get("content"), str):
+            record["content"] = fix_verses([record["content"]])[0]
+    return json.dumps(record, ensure_ascii=False)
+
+
+def fix_file(filename: str, output: Optional[str] = None) -> Optional[str]:
     """
-    Fix encoding in an existing JSON file containing Sanskrit verses.
+    Fix encoding in an existing JSON or JSONL file containing Sanskrit verses.
+
+    JSONL files (".jsonl") are repaired line by line. JSON files are streamed
+    with ijson (see write_fixed_json_events()) if it is installed, and
+    loaded into memory otherwise. Either way the output is written
+    atomically, so output may be the input file itself.
 
     Args:
-        filename (str): Path to the JSON file to fix.
+        filename (str): Path to the JSON or JSONL file to fix.
         output (Optional[str], optional): Output file path. If None, creates a new file
             with '_fixed' suffix in the same directory. Defaults to None.
 
+    Returns:
+        Optional[str]: Path of the fixed file, or None if the file could not
+            be fixed.
+
     Note:
         This is useful for fixing previously scraped files with encoding issues.
+        Streaming keeps memory use constant for corpus dumps of any size.
     """
     try:
-        logging.info(f"Loading JSON from {filename}")
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # Fix encoding
-        fixed_data = fix_encoding(data)
-
         # Determine output filename
         if not output:
-            base_name = os.path.splitext(os.path.basename(filename))[0]
-            output = f"{
-                os.path.dirname(filename) or '.'}/{base_name}_fixed.json"
+            base_name, extension = os.path.splitext(os.path.basename(filename))
+            output = os.path.join(
+                os.path.dirname(filename) or ".",
+                f"{base_name}_fixed{extension or '.json'}",
+            )
 
-        # Save the fixed data
-        save_data(fixed_data, output, "json")
+        if filename.endswith(".jsonl"):
+            logging.info(f"Repairing JSONL line by line from {filename}")
+            with open(filename, encoding="utf-8") as src, atomic_write(output) as f:
+                for line in src:
+                    if line.strip():
+                        f.write(fix_jsonl_line(line) + "\n")
+        elif ijson is not None:
+            logging.info(f"Streaming JSON from {filename}")
+            with open(filename, "rb") as src, atomic_write(output) as f:
+                write_fixed_json_events(ijson.parse(src), f)
+        else:
+            logging.info(f"Loading JSON from {filename}")
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            # Fix encoding of a chapter, or of each chapter of a merged dump
+            if isinstance(data, list):
+                fixed_data = [
+                    fix_encoding(item) if isinstance(item, dict) else item
+                    for item in data
+                ]
+            else:
+                fixed_data = fix_encoding(data)
+            with atomic_write(output) as f:
+                json.dump(fixed_data, f, ensure_ascii=False, indent=4)
+
+        logging.info(f"Fixed verses saved to {output}")
+        return output
 
     except Exception as e:
         logging.error(f"Error fixing file {filename}: {e}")
+        return None
+
+
+def fix_files(
+    filenames: List[str], workers: int = DEFAULT_WORKERS, in_place: bool = False
+) -> List[Optional[str]]:
+    """
+    Fix the encoding of several files, in parallel processes.
+
+    Args:
+        filenames (List[str]): JSON or JSONL files to fix, see fix_file().
+        workers (int, optional): Number of processes. Defaults to DEFAULT_WORKERS,
+            which fixes the files one after another in this process.
+        in_place (bool, optional): Replace each file with its fixed version
+            instead of writing a new file with a '_fixed' suffix. Defaults to False.
+
+    Returns:
+        List[Optional[str]]: Path of each fixed file, in the order of
+            filenames, or None for files that could not be fixed.
+    """
+    outputs = filenames if in_place else [None] * len(filenames)
+    workers = min(max(1, workers), len(filenames))
+    if workers <= 1:
+        return [
+            fix_file(filename, output) for filename, output in zip(filenames, outputs)
+        ]
+
+    logging.info(f"Fixing {len(filenames)} files in {workers} processes")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                fix_file,
+                filenames,
+                outputs,
+                chunksize=max(1, len(filenames) // (workers * 4)),
+            )
+        )
+
+
+def find_chapter_files(directory: str) -> List[str]:
+    """
+    Find the JSON and JSONL output files of a crawl.
+
+    Args:
+        directory (str): Output directory of the crawl.
+
+    Returns:
+        List[str]: Sorted paths of all ".json" and ".jsonl" files below the
+            directory, except the summary and the crawl manifest. Hidden
+            directories, such as an HTTP cache, are skipped.
+    """
+    skipped = {SUMMARY_FILENAME, MANIFEST_FILENAME}
+    filenames = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if name.endswith((".json", ".jsonl")) and name not in skipped:
+                filenames.append(os.path.join(root, name))
+    return sorted(filenames)
+
+
+def resolve_recorded_file(path: str, directory: str) -> str:
+    """
+    Find a chapter file recorded in the summary or manifest of a crawl.
+
+    Recorded paths include the output directory as it was given to the
+    crawl, relative to the working directory of the crawl. They are looked up
+    below `directory`, dropping leading components one at a time, so they
+    resolve from any working directory and after the output directory was
+    moved.
+
+    Args:
+        path (str): Path recorded by the crawl.
+        directory (str): Output directory of the crawl.
+
+    Returns:
+        str: Real path of the file, or of `path` itself if it is not found
+            below the directory.
+    """
+    if os.path.isabs(path) and os.path.exists(path):
+        return os.path.realpath(path)
+    parts = os.path.normpath(path).lstrip(os.sep).split(os.sep)
+    for i in range(len(parts)):
+        candidate = os.path.join(directory, *parts[i:])
+        if os.path.isfile(candidate):
+            return os.path.realpath(candidate)
+    return os.path.realpath(path)
+
+
+def _update_crawl_records(
+    directory: str, fixed: Set[str], stats: Dict[str, Any]
+) -> None:
+    """
+    Bring the summary and manifest of a crawl up to date after fix_directory().
+
+    The repair is recorded under 'encoding_fix' in the summary. If every
+    chapter was saved as a JSON file, 'duplicate_verses' is recomputed from
+    the repaired verses, since mis-decoded verse references hide repeats.
+    The manifest records the new hashes of the repaired files. Recorded file
+    paths are resolved with resolve_recorded_file().
+
+    Args:
+        directory (str): Output directory of the crawl.
+        fixed (Set[str]): Real paths of the repaired files.
+        stats (Dict[str, Any]): Statistics of the repair.
+    """
+    summary_file = os.path.join(directory, SUMMARY_FILENAME)
+    if os.path.exists(summary_file):
+        with open(summary_file, encoding="utf-8") as f:
+            summary = json.load(f)
+
+        chapters = summary.get("chapters", [])
+        files = [
+            resolve_recorded_file(chapter.get("file", ""), directory)
+            for chapter in chapters
+        ]
+        if chapters and not fixed.intersection(files):
+            logging.warning(
+                f"None of the chapters in {summary_file} match a repaired file"
+            )
+        if chapters and all(path.endswith(".json") and path in fixed for path in files):
+            verse_index = VerseIndex()
+            for i, path in enumerate(files):
+                with open(path, encoding="utf-8") as f:
+                    verse_index.add(i, json.load(f))
+            summary["duplicate_verses"] = verse_index.duplicates()
+
+        summary["encoding_fix"] = stats
+        with atomic_write(summary_file) as f:
+            json.dump(summary, f, ensure_ascii=False, indent=4)
+        logging.info(f"Updated {summary_file}")
+
+    manifest_file = os.path.join(directory, MANIFEST_FILENAME)
+    if os.path.exists(manifest_file):
+        manifest = CrawlManifest(manifest_file, resume=True)
+        try:
+            updated = manifest.rehash(fixed, directory)
+        finally:
+            manifest.close()
+        logging.info(f"Updated the hashes of {updated} chapters in {manifest_file}")
+
+
+def fix_directory(directory: str, workers: int = DEFAULT_WORKERS) -> Dict[str, Any]:
+    """
+    Fix the encoding of every chapter file of a crawl, in place.
+
+    Files are found with find_chapter_files(), repaired with fix_files() in a
+    process pool and replaced atomically. Afterwards the crawl summary and
+    manifest are updated, see _update_crawl_records().
+
+    Args:
+        directory (str): Output directory of the crawl.
+        workers (int, optional): Number of processes. Defaults to DEFAULT_WORKERS.
+
+    Returns:
+        Dict[str, Any]: Statistics with the 'timestamp', the number of 'files'
+            fixed and 'failed', the 'seconds' taken and 'files_per_sec'.
+    """
+    filenames = find_chapter_files(directory)
+    if not filenames:
+        logging.warning(f"No JSON or JSONL files found in {directory}")
+
+    start = time.perf_counter()
+    outputs = fix_files(filenames, workers, in_place=True) if filenames else []
+    seconds = time.perf_counter() - start
+
+    fixed = {os.path.realpath(output) for output in outputs if output}
+    stats = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "files": len(fixed),
+        "failed": len(filenames) - len(fixed),
+        "seconds": round(seconds, 3),
+        "files_per_sec": round(len(fixed) / seconds, 1) if seconds else None,
+    }
+    logging.info(
+        f"Fixed {stats['files']} files ({stats['failed']} failed) in "
+        f"{seconds:.2f}s: {stats['files_per_sec']} files/sec"
+    )
+    if fixed:
+        _update_crawl_records(directory, fixed, stats)
+    return stats
 
 
 def process_all_chapters(args: argparse.Namespace, session: requests.Session) -> None:
@@ -588,7 +4501,7 @@ def process_all_chapters(args: argparse.Namespace, session: requests.Session) ->
     logging.info(f"Starting to scrape all chapters from {args.url}")
 
     # Check if scraping is allowed
-    if not check_robots_txt(args.url, session.headers["User-Agent"]):
+    if not check_robots_txt(args.url, session.headers["User-Agent"], session):
         logging.error(
             f"Scraping not allowed for {
                 args.url} according to robots.txt"
@@ -596,13 +4509,10 @@ def process_all_chapters(args: argparse.Namespace, session: requests.Session) ->
         return
 
     try:
-        # Fetch and parse contents page
-        response = session.get(args.url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Extract chapter links
-        chapter_links = extract_chapter_links(soup, args.url)
+        # Fetch contents page and extract chapter links
+        frontier = CrawlFrontier(args.max_depth, args.bloom_filter)
+        frontier.visit(args.url, 0)
+        chapter_links = fetch_chapter_links(args.url, session)
 
         if not chapter_links:
             logging.error("No chapter links found on the contents page")
@@ -613,13 +4523,95 @@ def process_all_chapters(args: argparse.Namespace, session: requests.Session) ->
         # Process all chapters
         output_dir = args.directory if args.directory else "ramayana_chapters"
         process_chapter_links(
-            chapter_links, session, args.format, args.fix_encoding, output_dir
+            chapter_links,
+            session,
+            args.format,
+            args.fix_encoding,
+            output_dir,
+            workers=args.workers,
+            backend=args.backend,
+            resume=args.resume,
+            parse_workers=args.parse_workers,
+            frontier=frontier,
         )
 
     except Exception as e:
         logging.error(f"Error processing contents page: {e}")
 
 
+def process_all_kandas(args: argparse.Namespace, session: requests.Session) -> None:
+    """
+    Process all chapters of every kanda linked from a site index page.
+
+    Args:
+        args (argparse.Namespace): Command line arguments.
+        session (requests.Session): Session object for making HTTP requests.
+
+    Note:
+        This function handles the entire workflow for whole-epic scraping:
+        1. Discovers the contents page of each kanda from the index page
+        2. Fetches the contents pages and collects the chapters of all kandas
+           into one list
+        3. Processes that list in a single process_chapter_links() call, so all
+           chapters share one worker pool, session and rate limiter
+        Per-chapter files are saved to one subdirectory per kanda.
+    """
+    logging.info(f"Starting to scrape all kandas from {args.url}")
+
+    # Check if scraping is allowed
+    if not check_robots_txt(args.url, session.headers["User-Agent"], session):
+        logging.error(
+            f"Scraping not allowed for {
+                args.url} according to robots.txt"
+        )
+        return
+
+    try:
+        frontier = CrawlFrontier(args.max_depth, args.bloom_filter)
+        frontier.visit(args.url, 0)
+        kandas = discover_kandas(args.url, session, frontier)
+        if not kandas:
+            logging.error("No kanda contents pages found on the index page")
+            return
+
+        logging.info(
+            f"Found {len(kandas)} kandas: {', '.join(k['kanda'] for k in kandas)}"
+        )
+
+        # Fetch the contents pages concurrently, keeping kanda order
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            kanda_chapters = executor.map(
+                lambda kanda: fetch_kanda_chapters(kanda, session, frontier), kandas
+            )
+            chapter_links = [
+                chapter for chapters in kanda_chapters for chapter in chapters
+            ]
+
+        if not chapter_links:
+            logging.error("No chapter links found in any kanda")
+            return
+
+        logging.info(f"Found {len(chapter_links)} chapters to scrape")
+
+        # Process the chapters of all kandas together
+        output_dir = args.directory if args.directory else "ramayana_chapters"
+        process_chapter_links(
+            chapter_links,
+            session,
+            args.format,
+            args.fix_encoding,
+            output_dir,
+            workers=args.workers,
+            backend=args.backend,
+            resume=args.resume,
+            parse_workers=args.parse_workers,
+            frontier=frontier,
+        )
+
+    except Exception as e:
+        logging.error(f"Error processing index page: {e}")
+
+
 def process_single_page(args: argparse.Namespace, session: requests.Session) -> None:
     """
     Process a single webpage for Sanskrit verses.
@@ -636,7 +4628,7 @@ def process_single_page(args: argparse.Namespace, session: requests.Session) ->
         4. Saves the data in the specified format
     """
     # Check if scraping is allowed
-    if not check_robots_txt(args.url, session.headers["User-Agent"]):
+    if not check_robots_txt(args.url, session.headers["User-Agent"], session):
         logging.error(
             f"Scraping not allowed for {
                 args.url} according to robots.txt"
@@ -645,7 +4637,10 @@ def process_single_page(args: argparse.Namespace, session: requests.Session) ->
 
     # Scrape the webpage
     logging.info(f"Starting to scrape {args.url}")
-    data = scrape_webpage(args.url, session)
+    try:
+        data = scrape_webpage(args.url, session)
+    finally:
+        close_thread_loops()
 
     if not data:
         logging.error("Failed to scrape data. Exiting.")
@@ -665,6 +4660,106 @@ def process_single_page(args: argparse.Namespace, session: requests.Session) ->
     save_data(data, args.output, args.format)
 
 
+def search_database(args: argparse.Namespace) -> None:
+    """
+    Search a SQLite corpus and print the matching verses.
+
+    Args:
+        args (argparse.Namespace): Command line arguments. The database is
+            args.output, or SqliteSink.filename in args.directory.
+    """
+    output_dir = args.directory if args.directory else "ramayana_chapters"
+    path = args.output or os.path.join(output_dir, SqliteSink.filename)
+
+    try:
+        results = search_corpus(path, args.search, args.limit)
+    except sqlite3.Error as e:
+        logging.error(f"Error searching {path}: {e}")
+        return
+
+    logging.info(f"{len(results)} verses matching {args.search!r} in {path}")
+    for result in results:
+        location = ".".join(
+            str(part)
+            for part in (result["kanda"], result["sarga"], result["verse_number"])
+            if part is not None
+        )
+        print(f"[{location}] {result['chapter_title'] or ''}".rstrip())
+        print(result["text"])
+        print(f"{result['url']}\n")
+
+
+def run_profiled(profiler: str, func: Callable, *args) -> Any:
+    """
+    Run a function under a profiler and report its hot spots.
+
+    The profile is written to the file PROFILE_FILES[profiler] in the
+    working directory, next to scraper.log, and the top PROFILE_TOP entries
+    are printed:
+
+    - "cprofile": functions by cumulative time; the .prof file can be loaded
+      with pstats, snakeviz or gprof2dot.
+    - "pyinstrument": the sampled call tree, saved as an HTML report.
+    - "tracemalloc": source lines by allocated memory still held at the end
+      of the run, plus the peak traced memory; the snapshot can be loaded
+      with tracemalloc.Snapshot.load().
+
+    Args:
+        profiler (str): One of PROFILERS.
+        func (Callable): Function to profile.
+        *args: Arguments for the function.
+
+    Returns:
+        Any: The return value of the function.
+
+    Note:
+        Only this process is profiled, not --parse-workers processes. Falls
+        back to cProfile with a warning if pyinstrument is not installed.
+    """
+    if profiler == "pyinstrument" and pyinstrument is None:
+        logging.warning("pyinstrument is not installed, profiling with cProfile")
+        profiler = "cprofile"
+    path = PROFILE_FILES[profiler]
+
+    if profiler == "cprofile":
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return func(*args)
+        finally:
+            profile.disable()
+            profile.dump_stats(path)
+            stats = pstats.Stats(profile)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP)
+            logging.info(f"cProfile stats written to {path}")
+
+    if profiler == "pyinstrument":
+        profile = pyinstrument.Profiler(async_mode="enabled")
+        profile.start()
+        try:
+            return func(*args)
+        finally:
+            profile.stop()
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(profile.output_html())
+            print(profile.output_text(unicode=True, color=False))
+            logging.info(f"pyinstrument report written to {path}")
+
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    try:
+        return func(*args)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        snapshot.dump(path)
+        print(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB")
+        print(f"Top {PROFILE_TOP} lines by allocated memory:")
+        for stat in snapshot.statistics("lineno")[:PROFILE_TOP]:
+            print(f"  {stat}")
+        logging.info(f"tracemalloc snapshot written to {path}")
+
+
 def main() -> None:
     """
     Main entry point for the scraper.
@@ -675,13 +4770,33 @@ def main() -> None:
     3. Processes files or URLs based on the specified mode
 
     Command line arguments:
-        url: URL of the webpage to scrape
-        -f/--format: Output format (json, csv, or txt)
+        url: URL of the webpage to scrape (optional with --fix-file, --fix-dir
+            and --search)
+        -f/--format: Output format (json, csv, txt, jsonl, parquet, or sqlite)
         -o/--output: Output file path
         -d/--directory: Output directory for multiple chapters
         --fix-encoding: Fix encoding issues in Sanskrit verses
-        --fix-file: Fix encoding in an existing JSON file
+        --fix-file: Fix encoding in existing JSON or JSONL files
+        --fix-dir: Fix encoding in place in all chapter files of a crawl
         --all-chapters: Scrape all chapters from a contents page
+        --all-kandas: Scrape all chapters of every kanda linked from an index page
+        --workers: Number of chapters to fetch concurrently
+        --resume: Skip chapters already saved by a previous crawl
+        --backend: Fetch backend for multi-chapter scraping
+        --parser: HTML parser backend
+        --parse-workers: Number of processes used for parsing
+        --max-depth: Maximum link depth of a multi-chapter crawl
+        --bloom-filter: Track seen URLs in a Bloom filter sized for N URLs
+        --rate: Maximum requests per second per host
+        --http-cache: Cache responses on disk and revalidate them
+        --offline: Serve all requests from the HTTP cache
+        --archive: Append every raw response to a WARC archive
+        --reparse: Re-run extraction over a WARC archive instead of the network
+        --search: Search the verses of a SQLite corpus instead of scraping
+        --limit: Maximum number of search results
+        --metrics-file: Write per-stage timing histograms for Prometheus
+        --profile: Profile the run with cProfile, pyinstrument or tracemalloc
+        --burst: Maximum burst of back-to-back requests per host
         --debug: Enable debug logging
 
     Returns:
@@ -689,11 +4804,16 @@ def main() -> None:
     """
     # Set up argument parser
     parser = argparse.ArgumentParser(description="Web Scraper Tool for Sanskrit Texts")
-    parser.add_argument("url", help="URL of the webpage to scrape")
+    parser.add_argument(
+        "url",
+        nargs="?",
+        help="URL of the webpage to scrape, not needed with --fix-file, --fix-dir "
+        "or --search",
+    )
     parser.add_argument(
         "-f",
         "--format",
-        choices=["json", "csv", "txt"],
+        choices=OUTPUT_FORMATS,
         default="json",
         help="Output file format (default: json)",
     )
@@ -704,18 +4824,145 @@ def main() -> None:
     parser.add_argument(
         "--fix-encoding",
         action="store_true",
-        help="Fix encoding issues in Sanskrit verses",
+        help="Fix encoding issues in Sanskrit verses (rarely needed, pages are "
+        "decoded with their resolved charset)",
+    )
+    parser.add_argument(
+        "--fix-file",
+        nargs="+",
+        metavar="FILE",
+        help="Fix encoding in existing JSON or JSONL files instead of scraping; "
+        "several files are fixed in --workers processes",
     )
     parser.add_argument(
-        "--fix-file", help="Fix encoding in an existing JSON file instead of scraping"
+        "--fix-dir",
+        metavar="DIR",
+        help="Fix encoding in place in every chapter file of a crawl output "
+        "directory, in --workers processes, and update its summary",
     )
     parser.add_argument(
         "--all-chapters",
         action="store_true",
         help="Scrape all chapters from a contents page",
     )
+    parser.add_argument(
+        "--all-kandas",
+        action="store_true",
+        help="Scrape all chapters of every kanda linked from an index page, "
+        "such as the site root",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Number of chapters to fetch concurrently, or of processes for "
+        f"--fix-file and --fix-dir (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted multi-chapter crawl, skipping saved chapters",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(FETCH_BACKENDS),
+        default="requests",
+        help="Fetch backend for --all-chapters and --all-kandas (default: requests)",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=HTML_PARSERS,
+        default=DEFAULT_PARSER,
+        help=f"HTML parser backend (default: {DEFAULT_PARSER})",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="Number of processes that parse pages for multi-chapter crawls while "
+        "fetching continues, 0 to parse in the fetch workers (default: 0)",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="Maximum link depth of a multi-chapter crawl, counting the start "
+        "page as 0 (default: no limit)",
+    )
+    parser.add_argument(
+        "--bloom-filter",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Track seen URLs in a Bloom filter sized for N URLs instead of an "
+        "exact set, for very large crawls (default: exact set)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help=f"Maximum requests per second per host, 0 to disable (default: {DEFAULT_RATE})",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=DEFAULT_BURST,
+        help=f"Maximum back-to-back requests per host (default: {DEFAULT_BURST})",
+    )
+    parser.add_argument(
+        "--http-cache",
+        nargs="?",
+        const=DEFAULT_HTTP_CACHE_DIR,
+        metavar="DIR",
+        help="Cache responses on disk and revalidate them with conditional "
+        f"requests (default directory: {DEFAULT_HTTP_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve all requests from the HTTP cache without using the network",
+    )
+    parser.add_argument(
+        "--archive",
+        metavar="FILE",
+        help="Append every raw response to a compressed WARC archive "
+        "(e.g. crawl.warc.gz)",
+    )
+    parser.add_argument(
+        "--reparse",
+        metavar="FILE",
+        help="Re-run extraction over a WARC archive written with --archive "
+        "instead of fetching from the network",
+    )
+    parser.add_argument(
+        "--search",
+        metavar="QUERY",
+        help="Search the verses of a SQLite corpus written with -f sqlite "
+        "instead of scraping (database: -o, or verses.sqlite in -d)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=SEARCH_LIMIT,
+        help=f"Maximum number of --search results (default: {SEARCH_LIMIT})",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="FILE",
+        help="Write per-stage timing histograms in the Prometheus text format "
+        "(e.g. scraper.prom) when the run finishes",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILERS,
+        help="Profile the run and print its hot spots; the profile is written "
+        "next to scraper.log (default profiler: cprofile)",
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     args = parser.parse_args()
+    if args.url is None and not (args.fix_file or args.fix_dir or args.search):
+        parser.error("the url argument is required to scrape")
 
     # Set up logging
     logging_level = logging.DEBUG if args.debug else logging.INFO
@@ -724,22 +4971,66 @@ def main() -> None:
         format="%(asctime)s - %(levelname)s - %(message)s",
         handlers=[logging.FileHandler("scraper.log"), logging.StreamHandler()],
     )
+    set_html_parser(args.parser)
 
-    # Fix encoding in existing file if requested
+    # Fix encoding in existing files if requested
     if args.fix_file:
-        fix_file(args.fix_file, args.output)
+        if len(args.fix_file) == 1:
+            fix_file(args.fix_file[0], args.output)
+        elif args.output:
+            parser.error("-o/--output can only be used with a single --fix-file")
+        else:
+            fix_files(args.fix_file, args.workers)
+        return
+    if args.fix_dir:
+        fix_directory(args.fix_dir, args.workers)
+        return
+
+    # Search an existing SQLite corpus if requested
+    if args.search:
+        search_database(args)
         return
 
     # Select random user agent and create session
     user_agent = random.choice(USER_AGENTS)
-    session = create_session()
+    if args.reparse:
+        logging.info(f"Replaying responses from {args.reparse}")
+        session = create_replay_session(ResponseArchive(args.reparse))
+        # Archived responses are served by the requests session only
+        args.backend = "requests"
+    else:
+        http_cache = None
+        if args.http_cache or args.offline:
+            http_cache = HTTPCache(
+                args.http_cache or DEFAULT_HTTP_CACHE_DIR, args.offline
+            )
+
+        session = create_session(
+            pool_maxsize=connection_pool_size(args.workers),
+            rate_limiter=RateLimiter(args.rate, args.burst),
+            http_cache=http_cache,
+            archive=ResponseArchive(args.archive) if args.archive else None,
+        )
     session.headers.update({"User-Agent": user_agent})
 
     # Process according to mode
-    if args.all_chapters:
-        process_all_chapters(args, session)
+    if args.all_kandas:
+        process = process_all_kandas
+    elif args.all_chapters:
+        process = process_all_chapters
     else:
-        process_single_page(args, session)
+        process = process_single_page
+    try:
+        if args.profile:
+            run_profiled(args.profile, process, args, session)
+        else:
+            process(args, session)
+    except KeyboardInterrupt:
+        logging.warning("Interrupted")
+        sys.exit(130)
+    finally:
+        if args.metrics_file:
+            get_stage_metrics().write_prometheus(args.metrics_file)
 
 
 if __name__ == "__main__":